@@ -0,0 +1,5 @@
+-- Benchmark trends read district_data_history by (source, year): the years
+-- probe groups by source, and the trend pivot pulls each source's base and
+-- latest year. The composite index serves both and covers source-only lookups.
+DROP INDEX IF EXISTS "district_data_history_source_idx";
+CREATE INDEX IF NOT EXISTS "district_data_history_source_year_idx" ON "district_data_history"("source", "year");
@@ -0,0 +1,116 @@
+"""Shared pipeline for applying manual corrections to matcher output CSVs.
+
+Used by build_corrected_csv.py and build_corrected_rev_incept.py, which only
+differ in their corrections tables, key normalization, and stats buckets.
+"""
+
+import csv
+import sys
+from collections import Counter
+from itertools import dropwhile
+
+OUT_MATCH_COLS = ['Matched LEAID', 'Matched DB Name', 'Match Type', 'Confidence', 'Notes']
+
+
+def run(input_path, header_prefix, id_cols, match_cols, key_fn, corrections,
+        classify, stats, out=None):
+    """Apply corrections to a matcher results CSV and write the corrected CSV.
+
+    Lines before the one starting with header_prefix (stderr noise captured
+    with the matcher output) are skipped. id_cols are copied, stripped, into
+    the leading output columns; match_cols are carried through as-is when a
+    row has no correction.
+
+    key_fn(ids) returns the corrections key for a row's id values, or None to
+    skip the row; it may normalize ids in place. classify(leaid, match_type)
+    names the stats bucket for a corrected row. Returns stats.
+    """
+    # Output is collected as CSV text chunks and written out at the end; the
+    # writer formats corrected rows straight into the chunk list.
+    chunks = _Chunks()
+    writer = csv.writer(chunks)
+    writer.writerow(list(id_cols) + OUT_MATCH_COLS)
+
+    with open(input_path, newline='') as f:
+        raw_lines = []
+        reader = csv.reader(_tracked(dropwhile(lambda line: not line.startswith(header_prefix), f), raw_lines))
+        header = next(reader)
+        raw_lines.clear()
+
+        # Resolve column positions once so the row loop indexes by integer
+        col = {name: k for k, name in enumerate(header)}
+        id_idx = [col[name] for name in id_cols]
+        match_idx = [col[name] for name in match_cols]
+        n_ids = len(id_idx)
+
+        # Most rows miss; a frozenset membership test is cheaper than probing
+        # the dict, which is only indexed on a hit
+        correction_keys = frozenset(corrections)
+
+        # When the input columns are already laid out like the output, rows
+        # without a correction can be copied through as their original text
+        passthrough = id_idx + match_idx == list(range(len(header)))
+
+        fixes = []
+        kept = 0
+        for row, raw, ids, key in _keyed_rows(reader, raw_lines, id_idx, key_fn):
+            if key in correction_keys:
+                fix = corrections[key]
+                leaid, db_name, mtype, conf, notes = fix
+                writer.writerow(ids + [leaid or '', db_name or '', mtype, conf, notes])
+                fixes.append(fix)
+            else:
+                # Keep original match
+                if passthrough and raw.endswith('\r\n') and ids == row[:n_ids]:
+                    chunks.append(raw)
+                else:
+                    writer.writerow(ids + [row[k] for k in match_idx])
+                kept += 1
+
+    stats["kept"] += kept
+    for bucket, n in Counter(classify(fix[0], fix[2]) for fix in fixes).items():
+        stats[bucket] += n
+
+    if out is None:
+        # Write through a 1 MiB buffer on stdout's descriptor; sys.stdout is
+        # line-buffered on a terminal and would flush once per row
+        sys.stdout.flush()
+        with open(sys.stdout.fileno(), 'w', buffering=1 << 20, encoding=sys.stdout.encoding,
+                  newline='', closefd=False) as stdout:
+            stdout.writelines(chunks)
+    else:
+        out.writelines(chunks)
+    return stats
+
+
+class _Chunks(list):
+    """List that csv.writer can write into."""
+    write = list.append
+
+
+def _keyed_rows(reader, raw_lines, id_idx, key_fn):
+    """Yield (row, raw, ids, key) for rows key_fn doesn't skip.
+
+    raw is the row's original text, taken from the lines _tracked recorded
+    while the reader parsed it.
+    """
+    for row in reader:
+        if not row:
+            # DictReader skipped blank lines; drop their text with them
+            raw_lines.clear()
+            continue
+
+        raw = raw_lines[0] if len(raw_lines) == 1 else ''.join(raw_lines)
+        raw_lines.clear()
+
+        ids = [row[k].strip() for k in id_idx]
+        key = key_fn(ids)
+        if key is not None:
+            yield row, raw, ids, key
+
+
+def _tracked(lines, seen):
+    """Yield lines unchanged, recording each one in seen."""
+    for line in lines:
+        seen.append(line)
+        yield line
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""Build both corrected match CSVs in a single process.
+
+Usage: python3 scripts/build_all.py <deduping_out.csv> <rev_incept_out.csv>
+
+Equivalent to running build_corrected_csv.py and build_corrected_rev_incept.py
+with stdout redirected to each output path, but pays interpreter startup and
+module imports once.
+"""
+
+import sys
+
+import build_corrected_csv
+import build_corrected_rev_incept
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__, file=sys.stderr)
+        sys.exit(1)
+
+    deduping_out, rev_incept_out = sys.argv[1:]
+    with open(deduping_out, 'w', newline='') as f:
+        build_corrected_csv.main(f)
+    with open(rev_incept_out, 'w', newline='') as f:
+        build_corrected_rev_incept.main(f)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,15 @@
 #!/usr/bin/env python3
 """Build corrected deduping CSV with manual fixes applied."""
 
-import csv
 import sys
 
-# Read the raw matched results (skip stderr line)
-with open('Data Files/deduping_matched_results.csv', newline='') as f:
-    lines = f.readlines()
-    for i, line in enumerate(lines):
-        if line.startswith('District,'):
-            break
-    reader = csv.DictReader(lines[i:])
-    rows = list(reader)
+from _corrections_common import run
+
+INPUT_PATH = 'Data Files/deduping_matched_results.csv'
 
 # ============================================================
 # MANUAL CORRECTIONS
-# Key: input district name (lowercase) → (leaid, db_name, match_type, confidence, notes)
+# Key: input district name (lowercase, unquoted) → (leaid, db_name, match_type, confidence, notes)
 # Use None for leaid/db_name when no match exists
 # ============================================================
 corrections = {
@@ -83,48 +77,29 @@ corrections = {
     "thomaston-upson county school district": ("1305280", "Upson County School District", "CORRECTED", "HIGH", "Thomaston is city within Upson County SD"),
 }
 
-# Write corrected CSV
-writer = csv.writer(sys.stdout)
-writer.writerow([
-    'District', 'State', 'NCES District (Given)', 'NCES School (Given)',
-    'Matched LEAID', 'Matched DB Name', 'Match Type', 'Confidence', 'Notes'
-])
 
-stats = {"corrected": 0, "kept": 0, "nulled": 0}
+def correction_key(ids):
+    district = ids[0]
+    if not district or district == '352':
+        return None
+    # Remove surrounding quotes, then lowercase to match correction keys
+    return district.strip('"').strip().lower()
+
 
-for row in rows:
-    district = row.get('District', '').strip()
-    state = row.get('State', '').strip()
-    nces_given = row.get('NCES District (Given)', '').strip()
-    nces_school = row.get('NCES School (Given)', '').strip()
+def classify(leaid, mtype):
+    return "corrected" if leaid else "nulled"
 
-    if not district or district == '352':
-        continue
-
-    key = district.lower().strip()
-    # Remove quotes
-    key = key.strip('"').strip()
-
-    if key in corrections:
-        leaid, db_name, mtype, conf, notes = corrections[key]
-        writer.writerow([
-            district, state, nces_given, nces_school,
-            leaid or '', db_name or '', mtype, conf, notes
-        ])
-        if leaid:
-            stats["corrected"] += 1
-        else:
-            stats["nulled"] += 1
-    else:
-        # Keep original match
-        writer.writerow([
-            district, state, nces_given, nces_school,
-            row.get('Matched LEAID', ''),
-            row.get('Matched DB Name', ''),
-            row.get('Match Type', ''),
-            row.get('Confidence', ''),
-            row.get('Alt Suggestions', '')
-        ])
-        stats["kept"] += 1
-
-print(f"\n--- Stats: {stats['corrected']} corrected, {stats['nulled']} set to null, {stats['kept']} kept as-is ---", file=sys.stderr)
+
+def main(out=None):
+    stats = run(
+        INPUT_PATH, 'District,',
+        ['District', 'State', 'NCES District (Given)', 'NCES School (Given)'],
+        ['Matched LEAID', 'Matched DB Name', 'Match Type', 'Confidence', 'Alt Suggestions'],
+        correction_key, corrections, classify,
+        {"corrected": 0, "kept": 0, "nulled": 0}, out,
+    )
+    print(f"\n--- Stats: {stats['corrected']} corrected, {stats['nulled']} set to null, {stats['kept']} kept as-is ---", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
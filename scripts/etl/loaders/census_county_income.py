@@ -9,9 +9,13 @@ API Docs: https://www.census.gov/data/developers/data-sets/Poverty-Statistics.ht
 
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
+from urllib3.util.retry import Retry
 
 
 # Census Bureau API base URL
@@ -28,59 +32,88 @@ STATE_FIPS = [
 ]
 
 
+def _fetch_state_county_income(
+    session: requests.Session,
+    state_fips: str,
+    year: int,
+    delay: float,
+) -> List[Dict]:
+    """Fetch county income records for one state."""
+    params = {
+        "get": "NAME,SAEMHI_PT,COUNTY",
+        "for": "county:*",
+        "in": f"state:{state_fips}",
+        "time": str(year),
+    }
+
+    try:
+        response = session.get(CENSUS_API_BASE, params=params, timeout=60)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        print(f"Error fetching state {state_fips}: {e}")
+        return []
+
+    if len(data) < 2:
+        return []
+
+    records = []
+    headers = data[0]
+    for row in data[1:]:
+        record = dict(zip(headers, row))
+        county_name = record.get("NAME", "")
+        income = record.get("SAEMHI_PT")
+
+        if income and income != "null":
+            records.append({
+                "state_fips": state_fips,
+                "county_name": county_name,
+                "median_household_income": float(income),
+                "year": year,
+            })
+
+    # Rate limit is per worker
+    time.sleep(delay)
+    return records
+
+
 def fetch_county_income(
     year: int = 2022,
     delay: float = 0.3,
+    max_workers: int = 8,
 ) -> List[Dict]:
     """
     Fetch county median household income from Census SAIPE API.
 
+    States are fetched concurrently over a shared keep-alive session.
+
     Args:
         year: Data year (e.g., 2022)
-        delay: Delay between requests in seconds
+        delay: Delay between requests in seconds, per worker
+        max_workers: Number of states fetched in parallel
 
     Returns:
-        List of county income records
+        List of county income records, in STATE_FIPS order
     """
-    all_records = []
-
     print(f"Fetching county median household income for year {year}...")
 
-    for state_fips in tqdm(STATE_FIPS, desc="Fetching states"):
-        url = f"{CENSUS_API_BASE}"
-        params = {
-            "get": "NAME,SAEMHI_PT,COUNTY",
-            "for": "county:*",
-            "in": f"state:{state_fips}",
-            "time": str(year),
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=max_workers,
+        pool_maxsize=max_workers,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+    ))
+
+    by_state = {}
+    with session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_fetch_state_county_income, session, state_fips, year, delay): state_fips
+            for state_fips in STATE_FIPS
         }
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Fetching states"):
+            by_state[futures[future]] = future.result()
 
-        try:
-            response = requests.get(url, params=params, timeout=60)
-            response.raise_for_status()
-            data = response.json()
-        except requests.RequestException as e:
-            print(f"Error fetching state {state_fips}: {e}")
-            continue
-
-        if len(data) < 2:
-            continue
-
-        headers = data[0]
-        for row in data[1:]:
-            record = dict(zip(headers, row))
-            county_name = record.get("NAME", "")
-            income = record.get("SAEMHI_PT")
-
-            if income and income != "null":
-                all_records.append({
-                    "state_fips": state_fips,
-                    "county_name": county_name,
-                    "median_household_income": float(income),
-                    "year": year,
-                })
-
-        time.sleep(delay)
+    all_records = [r for state_fips in STATE_FIPS for r in by_state[state_fips]]
 
     print(f"Total county income records fetched: {len(all_records)}")
     return all_records
@@ -91,6 +124,7 @@ def update_district_income(
     records: List[Dict],
     year: int,
     batch_size: int = 500,
+    verbose: bool = False,
 ) -> dict:
     """
     Update district_education_data with median household income from county data.
@@ -99,74 +133,111 @@ def update_district_income(
         connection_string: PostgreSQL connection string
         records: List of county income records
         year: Year the data is from
-        batch_size: Records per batch update
+        batch_size: Counties per temp table INSERT statement
+        verbose: Also count districts with income data (a full table scan)
 
     Returns:
-        Dict with update statistics
+        Dict with update statistics; total_with_data only when verbose
     """
     import psycopg2
+    from psycopg2.extras import execute_values
 
     conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
 
-    updated_count = 0
-    matched_counties = 0
+    # The update is one transaction, and a lost commit just means re-running
+    # the load, so don't wait on the WAL flush for it
+    cur.execute("SET LOCAL synchronous_commit = off")
 
     print(f"Updating district median household income from {len(records)} counties...")
 
-    for record in tqdm(records, desc="Updating districts"):
-        state_fips = record["state_fips"]
-        county_name = record["county_name"]
-        income = record["median_household_income"]
+    # Counties that at least one district sits in; the rest would only be
+    # loaded into the temp table to match nothing
+    cur.execute("SELECT DISTINCT state_fips, county_name FROM districts")
+    district_counties = set(cur.fetchall())
 
-        # Update all districts in this county
-        # First, insert into district_education_data if not exists
-        cur.execute("""
-            INSERT INTO district_education_data (leaid, median_household_income, saipe_data_year, created_at, updated_at)
-            SELECT d.leaid, %s, %s, NOW(), NOW()
-            FROM districts d
-            WHERE d.state_fips = %s AND d.county_name = %s
-            AND d.leaid NOT IN (SELECT leaid FROM district_education_data)
-        """, (income, year, state_fips, county_name))
-        inserted = cur.rowcount
-
-        # Then update existing records
-        cur.execute("""
-            UPDATE district_education_data
-            SET median_household_income = %s,
-                saipe_data_year = %s,
-                updated_at = NOW()
-            FROM districts d
-            WHERE district_education_data.leaid = d.leaid
-            AND d.state_fips = %s
-            AND d.county_name = %s
-        """, (income, year, state_fips, county_name))
-        updated = cur.rowcount
-
-        if inserted > 0 or updated > 0:
-            matched_counties += 1
-            updated_count += inserted + updated
-
-    conn.commit()
+    # One row per county; a later record for the same county wins
+    counties = {
+        (r["state_fips"], r["county_name"]): r["median_household_income"]
+        for r in records
+        if (r["state_fips"], r["county_name"]) in district_counties
+    }
+    matched_counties = len(counties)
 
-    # Get count of districts with income data
+    # Create temp table so the district updates run as two set-based statements
     cur.execute("""
-        SELECT COUNT(*) FROM district_education_data
-        WHERE median_household_income IS NOT NULL
+        CREATE TEMP TABLE county_income_updates (
+            state_fips VARCHAR(2),
+            county_name VARCHAR(100),
+            median_household_income NUMERIC,
+            PRIMARY KEY (state_fips, county_name)
+        )
     """)
-    total_with_income = cur.fetchone()[0]
 
-    cur.close()
-    conn.close()
+    insert_temp_sql = """
+        INSERT INTO county_income_updates (state_fips, county_name, median_household_income)
+        VALUES %s
+    """
+
+    values = [
+        (state_fips, county_name, income)
+        for (state_fips, county_name), income in counties.items()
+    ]
+
+    # One multi-row INSERT per batch_size counties (execute_values defaults to
+    # splitting every call into 100-row statements)
+    execute_values(cur, insert_temp_sql, values, template="(%s, %s, %s)", page_size=batch_size)
+
+    # Insert district_education_data rows for districts that don't have one yet
+    cur.execute("""
+        INSERT INTO district_education_data (leaid, median_household_income, saipe_data_year, created_at, updated_at)
+        SELECT d.leaid, u.median_household_income, %s, NOW(), NOW()
+        FROM county_income_updates u
+        JOIN districts d ON d.state_fips = u.state_fips AND d.county_name = u.county_name
+        WHERE NOT EXISTS (
+            SELECT 1 FROM district_education_data e WHERE e.leaid = d.leaid
+        )
+    """, (year,))
+    inserted = cur.rowcount
 
-    print(f"Districts with median household income: {total_with_income}")
+    # Then update every district_education_data row in a matched county
+    cur.execute("""
+        UPDATE district_education_data
+        SET median_household_income = u.median_household_income,
+            saipe_data_year = %s,
+            updated_at = NOW()
+        FROM districts d
+        JOIN county_income_updates u ON d.state_fips = u.state_fips AND d.county_name = u.county_name
+        WHERE district_education_data.leaid = d.leaid
+    """, (year,))
+    updated = cur.rowcount
+    updated_count = inserted + updated
+
+    # Drop temp table
+    cur.execute("DROP TABLE county_income_updates")
 
-    return {
+    conn.commit()
+
+    result = {
         "matched_counties": matched_counties,
         "districts_updated": updated_count,
-        "total_with_data": total_with_income,
     }
 
+    if verbose:
+        # Get count of districts with income data
+        cur.execute("""
+            SELECT COUNT(*) FROM district_education_data
+            WHERE median_household_income IS NOT NULL
+        """)
+        total_with_income = cur.fetchone()[0]
+        print(f"Districts with median household income: {total_with_income}")
+        result["total_with_data"] = total_with_income
+
+    cur.close()
+    conn.close()
+
+    return result
+
 
 def main():
     """CLI entry point."""
@@ -178,6 +249,7 @@ def main():
     parser = argparse.ArgumentParser(description="Fetch Census county median household income")
     parser.add_argument("--year", type=int, default=2022, help="Data year")
     parser.add_argument("--delay", type=float, default=0.3, help="Delay between API calls")
+    parser.add_argument("--verbose", action="store_true", help="Report total districts with income data")
 
     args = parser.parse_args()
 
@@ -191,7 +263,8 @@ def main():
         result = update_district_income(
             connection_string,
             records,
-            year=args.year
+            year=args.year,
+            verbose=args.verbose,
         )
         print(f"County income import complete: {result}")
     else:
@@ -12,12 +12,13 @@ Fiscal Year Logic:
 
 import os
 import csv
+import io
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
-from collections import defaultdict
+from itertools import islice
+import pandas as pd
 import psycopg2
-from psycopg2.extras import execute_values
 from tqdm import tqdm
 
 # Import utilities
@@ -32,10 +33,28 @@ def parse_po_date(date_str: str) -> Optional[datetime]:
     Parse PO date from ISO format string.
 
     Handles formats like: 2026-01-28T12:00:00.000Z
+
+    The fixed-width GovSpend format is sliced into fields directly and
+    returns a naive datetime (only year and month are used downstream);
+    anything else goes through fromisoformat.
     """
     if not date_str or not date_str.strip():
         return None
 
+    s = date_str.strip()
+    if (
+        len(s) >= 19 and s[4] == '-' and s[7] == '-' and s[10] == 'T'
+        and s[13] == ':' and s[16] == ':'
+        and (s[0:4] + s[5:7] + s[8:10] + s[11:13] + s[14:16] + s[17:19]).isdigit()
+    ):
+        try:
+            return datetime(
+                int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                int(s[11:13]), int(s[14:16]), int(s[17:19]),
+            )
+        except ValueError:
+            pass
+
     try:
         # Handle ISO format with Z suffix
         date_str = date_str.strip().replace('Z', '+00:00')
@@ -48,6 +67,10 @@ def parse_po_date(date_str: str) -> Optional[datetime]:
             return None
 
 
+# "FYnn" labels by fiscal year, filled in by get_fiscal_year as years appear
+FY_LABELS: Dict[int, str] = {}
+
+
 def get_fiscal_year(date: datetime) -> str:
     """
     Get fiscal year string from a date.
@@ -56,43 +79,59 @@ def get_fiscal_year(date: datetime) -> str:
     - July 2025 - June 2026 = FY26
     - July 2024 - June 2025 = FY25
     """
-    if date.month >= 7:
-        # July-December: FY is next calendar year
-        fy = date.year + 1
-    else:
-        # January-June: FY is current calendar year
-        fy = date.year
+    # July-December: FY is next calendar year; January-June: current year
+    fy = date.year + (date.month >= 7)
+
+    # Last 2 digits with FY prefix, formatted once per fiscal year
+    label = FY_LABELS.get(fy)
+    if label is None:
+        label = FY_LABELS[fy] = f"FY{fy % 100:02d}"
+    return label
 
-    # Return last 2 digits with FY prefix
-    return f"FY{fy % 100:02d}"
 
+# Records per pandas groupby when aggregating
+AGGREGATE_CHUNK_SIZE = 100_000
 
-def parse_csv_row(row: Dict[str, str]) -> Optional[Dict]:
+# CSV columns parse_csv_row needs to build a record
+REQUIRED_COLUMNS = ("NCES ID - Clean", "Competitor", "PO Date", "PO Spend")
+
+# CSV columns parse_csv_row reads, in the order of its idx positions; POID
+# only fills po_id and may be absent
+CSV_COLUMNS = REQUIRED_COLUMNS + ("POID",)
+
+
+def parse_csv_row(row: List[str], idx: Tuple[int, ...]) -> Optional[Dict]:
     """
     Parse a CSV row into a normalized record.
 
+    Args:
+        row: Row values as read by csv.reader
+        idx: Positions of the CSV_COLUMNS columns in the row
+
     Returns None if the row cannot be parsed (missing required fields).
     """
+    leaid_i, competitor_i, po_date_i, spend_i, po_id_i = idx
+
     # Get NCES ID (LEAID)
-    leaid_raw = row.get("NCES ID - Clean", "")
+    leaid_raw = row[leaid_i]
     leaid = normalize_leaid(leaid_raw)
 
     if not leaid:
         return None
 
     # Get competitor name
-    competitor = row.get("Competitor", "").strip()
+    competitor = row[competitor_i].strip()
     if not competitor:
         return None
 
     # Parse PO date
-    po_date_str = row.get("PO Date", "")
+    po_date_str = row[po_date_i]
     po_date = parse_po_date(po_date_str)
     if not po_date:
         return None
 
     # Parse spend amount
-    spend = parse_currency(row.get("PO Spend", ""))
+    spend = parse_currency(row[spend_i])
     if spend <= 0:
         return None
 
@@ -104,76 +143,103 @@ def parse_csv_row(row: Dict[str, str]) -> Optional[Dict]:
         "competitor": competitor,
         "fiscal_year": fiscal_year,
         "spend": spend,
-        "po_id": row.get("POID", ""),
+        "po_id": row[po_id_i],
     }
 
 
-def load_competitor_spend_csv(csv_path: Path) -> List[Dict]:
+def iter_competitor_spend_csv(csv_path: Path) -> Iterator[Dict]:
     """
-    Load and parse the competitor spend CSV file.
+    Parse the competitor spend CSV file, yielding records as they are read.
 
     Args:
         csv_path: Path to the CSV file
 
-    Returns:
-        List of parsed records
+    Yields:
+        Parsed records
     """
-    records = []
+    parsed = 0
     skipped = 0
 
-    with open(csv_path, "r", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
+    # Read through a 1 MiB buffer; rows are plain lists indexed by column
+    # position rather than per-row dicts
+    with open(csv_path, "rb", buffering=1 << 20) as raw, \
+            io.TextIOWrapper(raw, encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        positions = {name: i for i, name in enumerate(header)}
+        missing = [name for name in REQUIRED_COLUMNS if name not in positions]
+        if missing:
+            raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+        width = len(header)
+
+        # Rows are cut or padded with "" to just past the header, and an
+        # optional column missing from it points at that last position
+        idx = tuple(positions.get(name, width) for name in CSV_COLUMNS)
+        pad = [""] * (width + 1)
+
         for row in tqdm(reader, desc="Parsing CSV"):
-            record = parse_csv_row(row)
+            if not row:
+                # Skip blank lines
+                continue
+            del row[width:]
+            row += pad[len(row):]
+            record = parse_csv_row(row, idx)
             if record:
-                records.append(record)
+                parsed += 1
+                yield record
             else:
                 skipped += 1
 
-    print(f"Parsed {len(records)} valid PO records, skipped {skipped}")
-    return records
+    print(f"Parsed {parsed} valid PO records, skipped {skipped}")
 
 
-def aggregate_by_district_competitor_fy(records: List[Dict]) -> List[Dict]:
+def aggregate_by_district_competitor_fy(
+    records: Iterable[Dict],
+    chunk_size: int = AGGREGATE_CHUNK_SIZE,
+) -> List[Dict]:
     """
     Aggregate PO records by district, competitor, and fiscal year.
 
+    Records are consumed chunk_size at a time and each chunk is reduced to
+    its per-group sums, so only one chunk of raw records is held in memory.
+
     Returns list of aggregated records with total_spend and po_count.
     """
-    # Use nested defaultdict for aggregation
-    aggregated = defaultdict(lambda: {"total_spend": 0.0, "po_count": 0})
-
-    for r in records:
-        key = (r["leaid"], r["competitor"], r["fiscal_year"])
-        aggregated[key]["total_spend"] += r["spend"]
-        aggregated[key]["po_count"] += 1
-
-    # Convert to list of records
-    result = []
-    for (leaid, competitor, fiscal_year), data in aggregated.items():
-        result.append({
-            "leaid": leaid,
-            "competitor": competitor,
-            "fiscal_year": fiscal_year,
-            "total_spend": round(data["total_spend"], 2),
-            "po_count": data["po_count"],
-        })
+    keys = ["leaid", "competitor", "fiscal_year"]
+
+    # Group in pandas rather than a Python dict loop; sort=False keeps groups
+    # in first-seen order
+    records = iter(records)
+    partials = []
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        df = pd.DataFrame.from_records(chunk, columns=keys + ["spend"])
+        partials.append(df.groupby(keys, sort=False, as_index=False).agg(
+            total_spend=("spend", "sum"),
+            po_count=("spend", "size"),
+        ))
+
+    if not partials:
+        print("Aggregated to 0 district-competitor-FY combinations")
+        return []
+
+    grouped = partials[0]
+    if len(partials) > 1:
+        grouped = pd.concat(partials, ignore_index=True).groupby(keys, sort=False, as_index=False).agg(
+            total_spend=("total_spend", "sum"),
+            po_count=("po_count", "sum"),
+        )
+    # Python's round() rather than Series.round(), which rounds ties like
+    # 12.345 down where round() rounds them up
+    grouped["total_spend"] = grouped["total_spend"].map(lambda spend: round(spend, 2))
+    result = grouped.to_dict("records")
 
     print(f"Aggregated to {len(result)} district-competitor-FY combinations")
     return result
 
 
-def get_valid_leaids(connection_string: str) -> set:
-    """Get set of valid LEAIDs from districts table."""
-    conn = psycopg2.connect(connection_string)
-    cur = conn.cursor()
-    cur.execute("SELECT leaid FROM districts")
-    leaids = {row[0] for row in cur.fetchall()}
-    cur.close()
-    conn.close()
-    return leaids
-
-
 COMPETITOR_TO_VENDOR = {
     "Proximity Learning": "proximity",
     "Elevate K12": "elevate",
@@ -186,29 +252,82 @@ GOVSPEND_VENDORS = list(COMPETITOR_TO_VENDOR.values())
 def upsert_competitor_spend(
     connection_string: str,
     records: List[Dict],
-    valid_leaids: set,
-    batch_size: int = 500
+    conn=None,
 ) -> Dict:
     """
     Upsert competitor spend records into district_financials.
 
-    Only inserts records for districts that exist in the districts table.
+    Only inserts records for districts that exist in the districts table;
+    records are staged in a temp table and joined against districts there.
     Maps competitor names to short vendor IDs (e.g. "Proximity Learning" → "proximity").
 
-    Returns dict with counts: matched, unmatched, upserted.
+    If conn is given it is used (and left open) instead of connecting.
+
+    Returns dict with counts: matched, unmatched, upserted, and the set of
+    matched_leaids.
     """
-    # Filter to valid LEAIDs
-    matched = [r for r in records if r["leaid"] in valid_leaids]
-    unmatched = [r for r in records if r["leaid"] not in valid_leaids]
+    if not records:
+        print("Matched 0 records to valid districts")
+        print("Unmatched 0 records (district not found)")
+        return {"matched": 0, "unmatched": 0, "upserted": 0, "matched_leaids": set()}
+
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
+    cur = conn.cursor()
 
-    print(f"Matched {len(matched)} records to valid districts")
-    print(f"Unmatched {len(unmatched)} records (district not found)")
+    # The whole reload is one transaction, and a lost commit just means
+    # re-running the ETL, so don't wait on the WAL flush for it
+    cur.execute("SET LOCAL synchronous_commit = off")
 
-    if not matched:
-        return {"matched": 0, "unmatched": len(unmatched), "upserted": 0}
+    # Stage every aggregated record so districts can be matched by a join
+    cur.execute("""
+        CREATE TEMP TABLE competitor_spend_stage (
+            leaid TEXT,
+            vendor TEXT,
+            fiscal_year TEXT,
+            total_revenue NUMERIC,
+            po_count INTEGER
+        )
+    """)
 
-    conn = psycopg2.connect(connection_string)
-    cur = conn.cursor()
+    buf = io.StringIO()
+    csv.writer(buf).writerows(
+        (
+            r["leaid"],
+            COMPETITOR_TO_VENDOR.get(r["competitor"], r["competitor"].lower().replace(" ", "_")),
+            r["fiscal_year"],
+            r["total_spend"],
+            r["po_count"],
+        )
+        for r in records
+    )
+    buf.seek(0)
+    cur.copy_expert("""
+        COPY competitor_spend_stage (
+            leaid, vendor, fiscal_year, total_revenue, po_count
+        ) FROM STDIN WITH (FORMAT csv)
+    """, buf)
+
+    cur.execute("""
+        SELECT DISTINCT s.leaid
+        FROM competitor_spend_stage s
+        JOIN districts d ON d.leaid = s.leaid
+    """)
+    matched_leaids = {row[0] for row in cur.fetchall()}
+    matched = sum(1 for r in records if r["leaid"] in matched_leaids)
+    unmatched = len(records) - matched
+
+    print(f"Matched {matched} records to valid districts")
+    print(f"Unmatched {unmatched} records (district not found)")
+
+    if not matched:
+        # Nothing to load; rolling back also drops the stage table
+        conn.rollback()
+        cur.close()
+        if own_conn:
+            conn.close()
+        return {"matched": 0, "unmatched": unmatched, "upserted": 0, "matched_leaids": matched_leaids}
 
     # Clear existing GovSpend vendor rows from district_financials
     print("Clearing existing GovSpend district_financials data...")
@@ -217,37 +336,30 @@ def upsert_competitor_spend(
         (GOVSPEND_VENDORS,)
     )
 
-    insert_sql = """
+    print(f"Inserting {matched} competitor spend records into district_financials...")
+    cur.execute("""
         INSERT INTO district_financials (
             leaid, vendor, fiscal_year, total_revenue, po_count, last_updated
-        ) VALUES %s
-    """
-
-    values = [
-        (
-            r["leaid"],
-            COMPETITOR_TO_VENDOR.get(r["competitor"], r["competitor"].lower().replace(" ", "_")),
-            r["fiscal_year"],
-            r["total_spend"],
-            r["po_count"],
-            datetime.now(),
         )
-        for r in matched
-    ]
+        SELECT s.leaid, s.vendor, s.fiscal_year, s.total_revenue, s.po_count, %s
+        FROM competitor_spend_stage s
+        JOIN districts d ON d.leaid = s.leaid
+    """, (datetime.now(),))
+    upserted = cur.rowcount
 
-    print(f"Inserting {len(values)} competitor spend records into district_financials...")
-    for i in tqdm(range(0, len(values), batch_size), desc="Inserting"):
-        batch = values[i:i+batch_size]
-        execute_values(cur, insert_sql, batch)
+    # Drop temp table
+    cur.execute("DROP TABLE competitor_spend_stage")
 
     conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
 
     return {
-        "matched": len(matched),
-        "unmatched": len(unmatched),
-        "upserted": len(matched),
+        "matched": matched,
+        "unmatched": unmatched,
+        "upserted": upserted,
+        "matched_leaids": matched_leaids,
     }
 
 
@@ -256,12 +368,21 @@ def log_data_refresh(
     records_updated: int,
     records_failed: int,
     status: str,
-    error_message: Optional[str] = None
+    error_message: Optional[str] = None,
+    conn=None,
 ):
-    """Log the ETL run to data_refresh_logs table."""
-    conn = psycopg2.connect(connection_string)
+    """
+    Log the ETL run to data_refresh_logs table.
+
+    If conn is given the row is written (and committed) on it instead of on
+    a new connection.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
 
+    now = datetime.now()
     cur.execute("""
         INSERT INTO data_refresh_logs (
             data_source, records_updated, records_failed, status, error_message, started_at, completed_at
@@ -272,43 +393,48 @@ def log_data_refresh(
         records_failed,
         status,
         error_message,
-        datetime.now(),
-        datetime.now(),
+        now,
+        now,
     ))
 
     conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
 
 
 def print_summary(records: List[Dict]):
     """Print summary statistics of the loaded data."""
     print("\n=== Competitor Spend Summary ===")
 
+    # One frame, grouped twice, instead of a Python pass per breakdown
+    df = pd.DataFrame.from_records(
+        records, columns=["leaid", "competitor", "fiscal_year", "total_spend", "po_count"]
+    )
+
     # By competitor
-    by_competitor = defaultdict(lambda: {"spend": 0, "count": 0, "districts": set()})
-    for r in records:
-        by_competitor[r["competitor"]]["spend"] += r["total_spend"]
-        by_competitor[r["competitor"]]["count"] += r["po_count"]
-        by_competitor[r["competitor"]]["districts"].add(r["leaid"])
+    by_competitor = df.groupby("competitor").agg(
+        spend=("total_spend", "sum"),
+        po_count=("po_count", "sum"),
+        districts=("leaid", "nunique"),
+    )
 
     print("\nBy Competitor:")
-    for competitor, data in sorted(by_competitor.items()):
-        print(f"  {competitor}:")
-        print(f"    Total Spend: ${data['spend']:,.2f}")
-        print(f"    PO Count: {data['count']}")
-        print(f"    Districts: {len(data['districts'])}")
+    for data in by_competitor.itertuples():
+        print(f"  {data.Index}:")
+        print(f"    Total Spend: ${data.spend:,.2f}")
+        print(f"    PO Count: {data.po_count}")
+        print(f"    Districts: {data.districts}")
 
     # By fiscal year
-    by_fy = defaultdict(lambda: {"spend": 0, "count": 0})
-    for r in records:
-        by_fy[r["fiscal_year"]]["spend"] += r["total_spend"]
-        by_fy[r["fiscal_year"]]["count"] += r["po_count"]
+    by_fy = df.groupby("fiscal_year").agg(
+        spend=("total_spend", "sum"),
+        po_count=("po_count", "sum"),
+    ).sort_index(ascending=False)
 
     print("\nBy Fiscal Year:")
-    for fy in sorted(by_fy.keys(), reverse=True):
-        data = by_fy[fy]
-        print(f"  {fy}: ${data['spend']:,.2f} ({data['count']} POs)")
+    for data in by_fy.itertuples():
+        print(f"  {data.Index}: ${data.spend:,.2f} ({data.po_count} POs)")
 
 
 def main():
@@ -339,23 +465,22 @@ def main():
     if not csv_path.exists():
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
 
+    conn = None
     try:
-        # Load and parse CSV
-        records = load_competitor_spend_csv(csv_path)
+        # Parse CSV records lazily
+        records = iter_competitor_spend_csv(csv_path)
 
-        # Aggregate by district-competitor-FY
+        # Aggregate by district-competitor-FY as records stream in
         aggregated = aggregate_by_district_competitor_fy(records)
 
-        # Get valid LEAIDs
-        print("Fetching valid LEAIDs from database...")
-        valid_leaids = get_valid_leaids(connection_string)
-        print(f"Found {len(valid_leaids)} valid district LEAIDs")
+        # One connection for the load, the run log, and the view refresh
+        conn = psycopg2.connect(connection_string)
 
-        # Upsert to database
-        result = upsert_competitor_spend(connection_string, aggregated, valid_leaids)
+        # Upsert to database (matched against districts server-side)
+        result = upsert_competitor_spend(connection_string, aggregated, conn=conn)
 
         # Print summary
-        matched_records = [r for r in aggregated if r["leaid"] in valid_leaids]
+        matched_records = [r for r in aggregated if r["leaid"] in result["matched_leaids"]]
         print_summary(matched_records)
 
         # Log success
@@ -363,12 +488,13 @@ def main():
             connection_string,
             records_updated=result["upserted"],
             records_failed=result["unmatched"],
-            status="success"
+            status="success",
+            conn=conn,
         )
 
         # Refresh materialized view so map tiles reflect new data
         from utils.refresh_views import refresh_map_features
-        refresh_map_features(connection_string)
+        refresh_map_features(connection_string, conn=conn)
 
         print(f"\n=== ETL Complete ===")
         print(f"Upserted: {result['upserted']} records")
@@ -376,14 +502,25 @@ def main():
 
     except Exception as e:
         print(f"ETL failed: {e}")
+        # Log on the shared connection unless it is unusable
+        log_conn = conn
+        if log_conn is not None:
+            try:
+                log_conn.rollback()
+            except psycopg2.Error:
+                log_conn = None
         log_data_refresh(
             connection_string,
             records_updated=0,
             records_failed=0,
             status="failed",
-            error_message=str(e)
+            error_message=str(e),
+            conn=log_conn,
         )
         raise
+    finally:
+        if conn is not None:
+            conn.close()
 
 
 if __name__ == "__main__":
@@ -23,7 +23,7 @@ from typing import Dict
 import psycopg2
 
 
-def compute_state_averages(connection_string: str) -> int:
+def compute_state_averages(connection_string: str, conn=None) -> int:
     """
     Compute enrollment-weighted state averages and update the states table.
 
@@ -39,168 +39,99 @@ def compute_state_averages(connection_string: str) -> int:
     - avg_read_proficiency
     (avg_expenditure_per_pupil and avg_graduation_rate already computed by state_aggregates.py)
 
+    Runs on conn when given (committing, but leaving it open); otherwise
+    opens its own connection.
+
     Returns:
         Number of states updated (including US row)
     """
-    conn = psycopg2.connect(connection_string)
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
 
-    # Update per-state averages
+    # Benchmarks are recomputed from scratch on every run, so a lost commit
+    # just means re-running them; don't wait on the WAL flush
+    cur.execute("SET LOCAL synchronous_commit = off")
+
+    # Per-state and national averages in one pass over districts: the
+    # GROUPING SETS grand total row (GROUPING(state_fips) = 1) feeds the US
+    # row (fips='00'). Districts without a state_fips land in a NULL-state
+    # group that matches no row, so they only count toward the national total.
     # Uses enrollment-weighted averages for rates, simple averages for counts
     cur.execute("""
-        UPDATE states s SET
-            avg_chronic_absenteeism_rate = agg.avg_absenteeism,
-            avg_student_teacher_ratio = agg.avg_str,
-            avg_swd_pct = agg.avg_swd,
-            avg_ell_pct = agg.avg_ell,
-            avg_enrollment = agg.avg_enroll,
-            avg_math_proficiency = agg.avg_math,
-            avg_read_proficiency = agg.avg_read,
-            aggregates_updated_at = NOW(),
-            updated_at = NOW()
-        FROM (
+        WITH agg AS (
             SELECT
-                state_fips,
+                CASE WHEN GROUPING(state_fips) = 1 THEN '00' ELSE state_fips END AS fips,
+                GROUPING(state_fips) = 1 AS is_national,
                 -- Enrollment-weighted absenteeism rate
-                CASE
-                    WHEN SUM(CASE WHEN chronic_absenteeism_rate IS NOT NULL THEN enrollment ELSE 0 END) > 0
-                    THEN ROUND((SUM(chronic_absenteeism_rate * enrollment) /
-                         SUM(CASE WHEN chronic_absenteeism_rate IS NOT NULL THEN enrollment ELSE 0 END))::numeric, 2)
-                    ELSE NULL
-                END AS avg_absenteeism,
+                ROUND((SUM(chronic_absenteeism_rate * enrollment) /
+                       NULLIF(SUM(enrollment) FILTER (WHERE chronic_absenteeism_rate IS NOT NULL), 0))::numeric, 2) AS avg_absenteeism,
                 -- Enrollment-weighted student-teacher ratio
-                CASE
-                    WHEN SUM(CASE WHEN student_teacher_ratio IS NOT NULL THEN enrollment ELSE 0 END) > 0
-                    THEN ROUND((SUM(student_teacher_ratio * enrollment) /
-                         SUM(CASE WHEN student_teacher_ratio IS NOT NULL THEN enrollment ELSE 0 END))::numeric, 2)
-                    ELSE NULL
-                END AS avg_str,
+                ROUND((SUM(student_teacher_ratio * enrollment) /
+                       NULLIF(SUM(enrollment) FILTER (WHERE student_teacher_ratio IS NOT NULL), 0))::numeric, 2) AS avg_str,
                 -- SWD percentage: total spec_ed / total enrollment * 100
-                CASE
-                    WHEN SUM(CASE WHEN spec_ed_students IS NOT NULL THEN enrollment ELSE 0 END) > 0
-                    THEN ROUND((SUM(spec_ed_students)::numeric /
-                         SUM(CASE WHEN spec_ed_students IS NOT NULL THEN enrollment ELSE 0 END) * 100)::numeric, 2)
-                    ELSE NULL
-                END AS avg_swd,
+                ROUND((SUM(spec_ed_students)::numeric /
+                       NULLIF(SUM(enrollment) FILTER (WHERE spec_ed_students IS NOT NULL), 0) * 100)::numeric, 2) AS avg_swd,
                 -- ELL percentage: total ell / total enrollment * 100
-                CASE
-                    WHEN SUM(CASE WHEN ell_students IS NOT NULL THEN enrollment ELSE 0 END) > 0
-                    THEN ROUND((SUM(ell_students)::numeric /
-                         SUM(CASE WHEN ell_students IS NOT NULL THEN enrollment ELSE 0 END) * 100)::numeric, 2)
-                    ELSE NULL
-                END AS avg_ell,
-                -- Simple average enrollment
-                ROUND(AVG(enrollment)) AS avg_enroll,
+                ROUND((SUM(ell_students)::numeric /
+                       NULLIF(SUM(enrollment) FILTER (WHERE ell_students IS NOT NULL), 0) * 100)::numeric, 2) AS avg_ell,
+                -- Simple average enrollment, from the same SUM/COUNT states
+                -- as total_enroll and total_dist (enrollment is never NULL here)
+                ROUND(SUM(enrollment)::numeric / COUNT(*)) AS avg_enroll,
                 -- Enrollment-weighted math proficiency
-                CASE
-                    WHEN SUM(CASE WHEN math_proficiency_pct IS NOT NULL THEN enrollment ELSE 0 END) > 0
-                    THEN ROUND((SUM(math_proficiency_pct * enrollment) /
-                         SUM(CASE WHEN math_proficiency_pct IS NOT NULL THEN enrollment ELSE 0 END))::numeric, 2)
-                    ELSE NULL
-                END AS avg_math,
+                ROUND((SUM(math_proficiency_pct * enrollment) /
+                       NULLIF(SUM(enrollment) FILTER (WHERE math_proficiency_pct IS NOT NULL), 0))::numeric, 2) AS avg_math,
                 -- Enrollment-weighted reading proficiency
-                CASE
-                    WHEN SUM(CASE WHEN read_proficiency_pct IS NOT NULL THEN enrollment ELSE 0 END) > 0
-                    THEN ROUND((SUM(read_proficiency_pct * enrollment) /
-                         SUM(CASE WHEN read_proficiency_pct IS NOT NULL THEN enrollment ELSE 0 END))::numeric, 2)
-                    ELSE NULL
-                END AS avg_read
-            FROM districts
-            WHERE state_fips IS NOT NULL AND enrollment IS NOT NULL AND enrollment > 0
-            GROUP BY state_fips
-        ) agg
-        WHERE s.fips = agg.state_fips
-    """)
-    state_count = cur.rowcount
-    print(f"Updated averages for {state_count} states")
-
-    # Compute national averages into the US row (fips='00')
-    cur.execute("""
-        UPDATE states SET
-            avg_chronic_absenteeism_rate = nat.avg_absenteeism,
-            avg_student_teacher_ratio = nat.avg_str,
-            avg_swd_pct = nat.avg_swd,
-            avg_ell_pct = nat.avg_ell,
-            avg_enrollment = nat.avg_enroll,
-            avg_math_proficiency = nat.avg_math,
-            avg_read_proficiency = nat.avg_read,
-            avg_expenditure_per_pupil = nat.avg_epp,
-            avg_graduation_rate = nat.avg_grad,
-            avg_poverty_rate = nat.avg_poverty,
-            total_districts = nat.total_dist,
-            total_enrollment = nat.total_enroll,
-            aggregates_updated_at = NOW(),
-            updated_at = NOW()
-        FROM (
-            SELECT
-                CASE
-                    WHEN SUM(CASE WHEN chronic_absenteeism_rate IS NOT NULL THEN enrollment ELSE 0 END) > 0
-                    THEN ROUND((SUM(chronic_absenteeism_rate * enrollment) /
-                         SUM(CASE WHEN chronic_absenteeism_rate IS NOT NULL THEN enrollment ELSE 0 END))::numeric, 2)
-                    ELSE NULL
-                END AS avg_absenteeism,
-                CASE
-                    WHEN SUM(CASE WHEN student_teacher_ratio IS NOT NULL THEN enrollment ELSE 0 END) > 0
-                    THEN ROUND((SUM(student_teacher_ratio * enrollment) /
-                         SUM(CASE WHEN student_teacher_ratio IS NOT NULL THEN enrollment ELSE 0 END))::numeric, 2)
-                    ELSE NULL
-                END AS avg_str,
-                CASE
-                    WHEN SUM(CASE WHEN spec_ed_students IS NOT NULL THEN enrollment ELSE 0 END) > 0
-                    THEN ROUND((SUM(spec_ed_students)::numeric /
-                         SUM(CASE WHEN spec_ed_students IS NOT NULL THEN enrollment ELSE 0 END) * 100)::numeric, 2)
-                    ELSE NULL
-                END AS avg_swd,
-                CASE
-                    WHEN SUM(CASE WHEN ell_students IS NOT NULL THEN enrollment ELSE 0 END) > 0
-                    THEN ROUND((SUM(ell_students)::numeric /
-                         SUM(CASE WHEN ell_students IS NOT NULL THEN enrollment ELSE 0 END) * 100)::numeric, 2)
-                    ELSE NULL
-                END AS avg_ell,
-                ROUND(AVG(enrollment)) AS avg_enroll,
-                CASE
-                    WHEN SUM(CASE WHEN math_proficiency_pct IS NOT NULL THEN enrollment ELSE 0 END) > 0
-                    THEN ROUND((SUM(math_proficiency_pct * enrollment) /
-                         SUM(CASE WHEN math_proficiency_pct IS NOT NULL THEN enrollment ELSE 0 END))::numeric, 2)
-                    ELSE NULL
-                END AS avg_math,
-                CASE
-                    WHEN SUM(CASE WHEN read_proficiency_pct IS NOT NULL THEN enrollment ELSE 0 END) > 0
-                    THEN ROUND((SUM(read_proficiency_pct * enrollment) /
-                         SUM(CASE WHEN read_proficiency_pct IS NOT NULL THEN enrollment ELSE 0 END))::numeric, 2)
-                    ELSE NULL
-                END AS avg_read,
-                CASE
-                    WHEN SUM(CASE WHEN expenditure_per_pupil IS NOT NULL THEN enrollment ELSE 0 END) > 0
-                    THEN ROUND((SUM(expenditure_per_pupil * enrollment) /
-                         SUM(CASE WHEN expenditure_per_pupil IS NOT NULL THEN enrollment ELSE 0 END))::numeric, 2)
-                    ELSE NULL
-                END AS avg_epp,
-                CASE
-                    WHEN SUM(CASE WHEN graduation_rate_total IS NOT NULL THEN enrollment ELSE 0 END) > 0
-                    THEN ROUND((SUM(graduation_rate_total * enrollment) /
-                         SUM(CASE WHEN graduation_rate_total IS NOT NULL THEN enrollment ELSE 0 END))::numeric, 2)
-                    ELSE NULL
-                END AS avg_grad,
-                ROUND(AVG(children_poverty_percent)::numeric, 2) AS avg_poverty,
+                ROUND((SUM(read_proficiency_pct * enrollment) /
+                       NULLIF(SUM(enrollment) FILTER (WHERE read_proficiency_pct IS NOT NULL), 0))::numeric, 2) AS avg_read,
+                -- National only (states get these from state_aggregates.py)
+                ROUND((SUM(expenditure_per_pupil * enrollment) /
+                       NULLIF(SUM(enrollment) FILTER (WHERE expenditure_per_pupil IS NOT NULL), 0))::numeric, 2) AS avg_epp,
+                ROUND((SUM(graduation_rate_total * enrollment) /
+                       NULLIF(SUM(enrollment) FILTER (WHERE graduation_rate_total IS NOT NULL), 0))::numeric, 2) AS avg_grad,
+                ROUND(SUM(children_poverty_percent) /
+                      NULLIF(COUNT(children_poverty_percent), 0), 2) AS avg_poverty,
                 COUNT(*) AS total_dist,
                 SUM(enrollment) AS total_enroll
             FROM districts
             WHERE enrollment IS NOT NULL AND enrollment > 0
-        ) nat
-        WHERE fips = '00'
+            GROUP BY GROUPING SETS ((state_fips), ())
+        )
+        UPDATE states s SET
+            avg_chronic_absenteeism_rate = agg.avg_absenteeism,
+            avg_student_teacher_ratio = agg.avg_str,
+            avg_swd_pct = agg.avg_swd,
+            avg_ell_pct = agg.avg_ell,
+            avg_enrollment = agg.avg_enroll,
+            avg_math_proficiency = agg.avg_math,
+            avg_read_proficiency = agg.avg_read,
+            avg_expenditure_per_pupil = CASE WHEN agg.is_national THEN agg.avg_epp ELSE s.avg_expenditure_per_pupil END,
+            avg_graduation_rate = CASE WHEN agg.is_national THEN agg.avg_grad ELSE s.avg_graduation_rate END,
+            avg_poverty_rate = CASE WHEN agg.is_national THEN agg.avg_poverty ELSE s.avg_poverty_rate END,
+            total_districts = CASE WHEN agg.is_national THEN agg.total_dist ELSE s.total_districts END,
+            total_enrollment = CASE WHEN agg.is_national THEN agg.total_enroll ELSE s.total_enrollment END,
+            aggregates_updated_at = NOW(),
+            updated_at = NOW()
+        FROM agg
+        WHERE s.fips = agg.fips
+        RETURNING agg.is_national
     """)
-    us_updated = cur.rowcount
+    updated = cur.fetchall()
+    us_updated = sum(1 for (is_national,) in updated if is_national)
+    state_count = len(updated) - us_updated
+    print(f"Updated averages for {state_count} states")
     print(f"Updated US national averages: {us_updated} row")
 
     conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
 
     return state_count + us_updated
 
 
-def compute_district_trends(connection_string: str) -> int:
+def compute_district_trends(connection_string: str, conn=None) -> int:
     """
     Compute derived percentages and 3-year trends on the districts table.
 
@@ -218,239 +149,219 @@ def compute_district_trends(connection_string: str) -> int:
     - read_proficiency_trend_3yr: point change in read_proficiency_pct
     - expenditure_pp_trend_3yr: % change in expenditure_per_pupil
 
+    Runs on conn when given (committing, but leaving it open); otherwise
+    opens its own connection.
+
     Returns:
         Number of districts updated
     """
-    conn = psycopg2.connect(connection_string)
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
 
+    # Benchmarks are recomputed from scratch on every run, so a lost commit
+    # just means re-running them; don't wait on the WAL flush
+    cur.execute("SET LOCAL synchronous_commit = off")
+    # The trend pivot hash-aggregates every district's history rows
+    cur.execute("SET LOCAL work_mem = '256MB'")
+
     # Step 1: Compute derived percentages from current district data
+    # Only rows whose percentages actually change are rewritten, so a re-run
+    # over unchanged data doesn't rewrite the whole table; the count is still
+    # every district with enrollment
     cur.execute("""
-        UPDATE districts SET
-            swd_pct = CASE
-                WHEN spec_ed_students IS NOT NULL AND enrollment IS NOT NULL AND enrollment > 0
-                     AND spec_ed_students <= enrollment
-                THEN ROUND((spec_ed_students::numeric / enrollment * 100), 2)
-                ELSE NULL
-            END,
-            ell_pct = CASE
-                WHEN ell_students IS NOT NULL AND enrollment IS NOT NULL AND enrollment > 0
-                     AND ell_students <= enrollment
-                THEN ROUND((ell_students::numeric / enrollment * 100), 2)
-                ELSE NULL
-            END
-        WHERE enrollment IS NOT NULL AND enrollment > 0
+        WITH pct AS (
+            SELECT
+                leaid,
+                CASE
+                    WHEN spec_ed_students IS NOT NULL AND spec_ed_students <= enrollment
+                    THEN ROUND((spec_ed_students::numeric / enrollment * 100), 2)
+                    ELSE NULL
+                END AS swd_pct,
+                CASE
+                    WHEN ell_students IS NOT NULL AND ell_students <= enrollment
+                    THEN ROUND((ell_students::numeric / enrollment * 100), 2)
+                    ELSE NULL
+                END AS ell_pct
+            FROM districts
+            WHERE enrollment IS NOT NULL AND enrollment > 0
+        ),
+        changed AS (
+            UPDATE districts d SET
+                swd_pct = p.swd_pct,
+                ell_pct = p.ell_pct
+            FROM pct p
+            WHERE d.leaid = p.leaid
+              AND (d.swd_pct IS DISTINCT FROM p.swd_pct OR d.ell_pct IS DISTINCT FROM p.ell_pct)
+        )
+        SELECT COUNT(*) FROM pct
     """)
-    pct_count = cur.rowcount
+    pct_count = cur.fetchone()[0]
     print(f"Computed swd_pct/ell_pct for {pct_count} districts")
 
-    # Step 2: Find year range for trends from ccd_directory history
+    # Step 2: Find the years each history source has data for, in one probe.
+    # Sources only count years where the metrics their trends use are present
+    # (ccd_directory counts every row).
     cur.execute("""
-        SELECT MIN(year), MAX(year) FROM district_data_history
+        SELECT source, ARRAY_AGG(DISTINCT year ORDER BY year DESC)
+        FROM district_data_history
         WHERE source = 'ccd_directory'
+           OR (source = 'edfacts_grad' AND graduation_rate IS NOT NULL)
+           OR (source = 'edfacts_assess' AND (math_proficiency_pct IS NOT NULL OR read_proficiency_pct IS NOT NULL))
+           OR (source = 'ccd_finance' AND expenditure_per_pupil IS NOT NULL)
+           OR (source = 'crdc_absenteeism' AND chronic_absenteeism_rate IS NOT NULL)
+        GROUP BY source
     """)
-    row = cur.fetchone()
-    if not row or row[0] is None:
+    source_years = dict(cur.fetchall())
+    if 'ccd_directory' not in source_years:
         print("No CCD directory history found. Skipping trends.")
         conn.commit()
         cur.close()
-        conn.close()
+        if own_conn:
+            conn.close()
         return pct_count
 
-    min_year, max_year = row
-    base_year = max(min_year, max_year - 3)
+    # (base year, latest year) per source: up to 3 years back from the latest
+    periods = {}
+    for source in ('ccd_directory', 'edfacts_grad', 'edfacts_assess', 'ccd_finance'):
+        years = source_years.get(source)
+        if years:
+            periods[source] = (max(years[-1], years[0] - 3), years[0])
+    # Use two most recent available years for absenteeism (biennial data)
+    abs_years = source_years.get('crdc_absenteeism', [])
+    if len(abs_years) >= 2:
+        periods['crdc_absenteeism'] = (abs_years[1], abs_years[0])
+
+    base_year, max_year = periods['ccd_directory']
     print(f"Computing trends: {base_year} → {max_year}")
 
-    # Step 3: Compute SWD and ELL trends (% change in count)
+    # Step 3: All trends in one pass over the base/latest history rows,
+    # pivoted to one row per district. A trend column is only overwritten
+    # when its source has data for the district; otherwise it is kept.
+    # - SWD/ELL (% change in count) and student-teacher ratio (point change)
+    #   from ccd_directory, whenever both years have a row
+    # - Graduation (point change) from edfacts_grad, only when both rates exist
+    # - Assessments (point change) from edfacts_assess, whenever both years have a row
+    # - Expenditure per pupil (% change) from ccd_finance, whenever both years have a row
+    # - Absenteeism (point change) from crdc_absenteeism, only when both rates exist
     cur.execute("""
-        WITH base AS (
-            SELECT leaid, spec_ed_students, ell_students,
-                   enrollment, teachers_fte
-            FROM district_data_history
-            WHERE source = 'ccd_directory' AND year = %s
+        WITH periods AS (
+            SELECT * FROM unnest(%s::text[], %s::int[], %s::int[])
+                AS p(source, base_year, latest_year)
+        ),
+        history AS (
+            SELECT h.*, h.year = p.base_year AS is_base, h.year = p.latest_year AS is_latest
+            FROM district_data_history h
+            JOIN periods p ON h.source = p.source AND h.year IN (p.base_year, p.latest_year)
         ),
-        latest AS (
-            SELECT leaid, spec_ed_students, ell_students,
-                   enrollment, teachers_fte
-            FROM district_data_history
-            WHERE source = 'ccd_directory' AND year = %s
+        pivot AS (
+            SELECT
+                leaid,
+                BOOL_OR(source = 'ccd_directory' AND is_base)
+                    AND BOOL_OR(source = 'ccd_directory' AND is_latest) AS has_ccd,
+                MAX(spec_ed_students) FILTER (WHERE source = 'ccd_directory' AND is_base) AS b_swd,
+                MAX(spec_ed_students) FILTER (WHERE source = 'ccd_directory' AND is_latest) AS l_swd,
+                MAX(ell_students) FILTER (WHERE source = 'ccd_directory' AND is_base) AS b_ell,
+                MAX(ell_students) FILTER (WHERE source = 'ccd_directory' AND is_latest) AS l_ell,
+                MAX(enrollment) FILTER (WHERE source = 'ccd_directory' AND is_base) AS b_enroll,
+                MAX(enrollment) FILTER (WHERE source = 'ccd_directory' AND is_latest) AS l_enroll,
+                MAX(teachers_fte) FILTER (WHERE source = 'ccd_directory' AND is_base) AS b_fte,
+                MAX(teachers_fte) FILTER (WHERE source = 'ccd_directory' AND is_latest) AS l_fte,
+                MAX(graduation_rate) FILTER (WHERE source = 'edfacts_grad' AND is_base) AS b_grad,
+                MAX(graduation_rate) FILTER (WHERE source = 'edfacts_grad' AND is_latest) AS l_grad,
+                BOOL_OR(source = 'edfacts_assess' AND is_base)
+                    AND BOOL_OR(source = 'edfacts_assess' AND is_latest) AS has_assess,
+                MAX(math_proficiency_pct) FILTER (WHERE source = 'edfacts_assess' AND is_base) AS b_math,
+                MAX(math_proficiency_pct) FILTER (WHERE source = 'edfacts_assess' AND is_latest) AS l_math,
+                MAX(read_proficiency_pct) FILTER (WHERE source = 'edfacts_assess' AND is_base) AS b_read,
+                MAX(read_proficiency_pct) FILTER (WHERE source = 'edfacts_assess' AND is_latest) AS l_read,
+                BOOL_OR(source = 'ccd_finance' AND is_base)
+                    AND BOOL_OR(source = 'ccd_finance' AND is_latest) AS has_finance,
+                MAX(expenditure_per_pupil) FILTER (WHERE source = 'ccd_finance' AND is_base) AS b_epp,
+                MAX(expenditure_per_pupil) FILTER (WHERE source = 'ccd_finance' AND is_latest) AS l_epp,
+                MAX(chronic_absenteeism_rate) FILTER (WHERE source = 'crdc_absenteeism' AND is_base) AS b_abs,
+                MAX(chronic_absenteeism_rate) FILTER (WHERE source = 'crdc_absenteeism' AND is_latest) AS l_abs
+            FROM history
+            GROUP BY leaid
         ),
         trends AS (
             SELECT
-                l.leaid,
+                leaid, has_ccd, has_assess, has_finance,
+                b_grad IS NOT NULL AND l_grad IS NOT NULL AS has_grad,
+                b_abs IS NOT NULL AND l_abs IS NOT NULL AS has_abs,
                 -- SWD trend: pct change in count
                 CASE
-                    WHEN b.spec_ed_students IS NOT NULL AND b.spec_ed_students > 0
-                         AND l.spec_ed_students IS NOT NULL
-                    THEN ROUND(((l.spec_ed_students - b.spec_ed_students)::numeric
-                         / b.spec_ed_students) * 100, 2)
+                    WHEN b_swd IS NOT NULL AND b_swd > 0 AND l_swd IS NOT NULL
+                    THEN ROUND(((l_swd - b_swd)::numeric / b_swd) * 100, 2)
                     ELSE NULL
                 END AS swd_trend,
                 -- ELL trend: pct change in count
                 CASE
-                    WHEN b.ell_students IS NOT NULL AND b.ell_students > 0
-                         AND l.ell_students IS NOT NULL
-                    THEN ROUND(((l.ell_students - b.ell_students)::numeric
-                         / b.ell_students) * 100, 2)
+                    WHEN b_ell IS NOT NULL AND b_ell > 0 AND l_ell IS NOT NULL
+                    THEN ROUND(((l_ell - b_ell)::numeric / b_ell) * 100, 2)
                     ELSE NULL
                 END AS ell_trend,
                 -- Student-teacher ratio trend: point change
                 CASE
-                    WHEN b.enrollment IS NOT NULL AND b.teachers_fte IS NOT NULL
-                         AND b.teachers_fte > 0
-                         AND l.enrollment IS NOT NULL AND l.teachers_fte IS NOT NULL
-                         AND l.teachers_fte > 0
-                    THEN ROUND((l.enrollment::numeric / l.teachers_fte)
-                         - (b.enrollment::numeric / b.teachers_fte), 2)
+                    WHEN b_enroll IS NOT NULL AND b_fte IS NOT NULL AND b_fte > 0
+                         AND l_enroll IS NOT NULL AND l_fte IS NOT NULL AND l_fte > 0
+                    THEN ROUND((l_enroll::numeric / l_fte) - (b_enroll::numeric / b_fte), 2)
+                    ELSE NULL
+                END AS str_trend,
+                ROUND((l_grad - b_grad)::numeric, 2) AS grad_trend,
+                ROUND((l_math - b_math)::numeric, 2) AS math_trend,
+                ROUND((l_read - b_read)::numeric, 2) AS read_trend,
+                CASE
+                    WHEN b_epp IS NOT NULL AND b_epp > 0 AND l_epp IS NOT NULL
+                    THEN ROUND(((l_epp - b_epp) / b_epp * 100)::numeric, 2)
                     ELSE NULL
-                END AS str_trend
-            FROM latest l
-            JOIN base b ON l.leaid = b.leaid
+                END AS epp_trend,
+                ROUND((l_abs - b_abs)::numeric, 2) AS abs_trend
+            FROM pivot
         )
         UPDATE districts d SET
-            swd_trend_3yr = t.swd_trend,
-            ell_trend_3yr = t.ell_trend,
-            student_teacher_ratio_trend_3yr = t.str_trend
+            swd_trend_3yr = CASE WHEN t.has_ccd THEN t.swd_trend ELSE d.swd_trend_3yr END,
+            ell_trend_3yr = CASE WHEN t.has_ccd THEN t.ell_trend ELSE d.ell_trend_3yr END,
+            student_teacher_ratio_trend_3yr = CASE WHEN t.has_ccd THEN t.str_trend ELSE d.student_teacher_ratio_trend_3yr END,
+            graduation_trend_3yr = CASE WHEN t.has_grad THEN t.grad_trend ELSE d.graduation_trend_3yr END,
+            math_proficiency_trend_3yr = CASE WHEN t.has_assess THEN t.math_trend ELSE d.math_proficiency_trend_3yr END,
+            read_proficiency_trend_3yr = CASE WHEN t.has_assess THEN t.read_trend ELSE d.read_proficiency_trend_3yr END,
+            expenditure_pp_trend_3yr = CASE WHEN t.has_finance THEN t.epp_trend ELSE d.expenditure_pp_trend_3yr END,
+            absenteeism_trend_3yr = CASE WHEN t.has_abs THEN t.abs_trend ELSE d.absenteeism_trend_3yr END
         FROM trends t
         WHERE d.leaid = t.leaid
-    """, (base_year, max_year))
-    swd_ell_count = cur.rowcount
-    print(f"Computed SWD/ELL/STR trends for {swd_ell_count} districts")
-
-    # Step 4: Graduation trend (point change) from edfacts_grad history
-    cur.execute("""
-        SELECT MIN(year), MAX(year) FROM district_data_history
-        WHERE source = 'edfacts_grad' AND graduation_rate IS NOT NULL
-    """)
-    grad_row = cur.fetchone()
-    if grad_row and grad_row[0] is not None:
-        grad_base = max(grad_row[0], grad_row[1] - 3)
-        cur.execute("""
-            WITH base AS (
-                SELECT leaid, graduation_rate FROM district_data_history
-                WHERE source = 'edfacts_grad' AND year = %s
-            ),
-            latest AS (
-                SELECT leaid, graduation_rate FROM district_data_history
-                WHERE source = 'edfacts_grad' AND year = %s
-            )
-            UPDATE districts d SET
-                graduation_trend_3yr = ROUND((l.graduation_rate - b.graduation_rate)::numeric, 2)
-            FROM latest l
-            JOIN base b ON l.leaid = b.leaid
-            WHERE d.leaid = l.leaid
-              AND l.graduation_rate IS NOT NULL
-              AND b.graduation_rate IS NOT NULL
-        """, (grad_base, grad_row[1]))
-        print(f"Computed graduation trends for {cur.rowcount} districts")
-
-    # Step 5: Assessment trends (point change) from edfacts_assess history
-    cur.execute("""
-        SELECT MIN(year), MAX(year) FROM district_data_history
-        WHERE source = 'edfacts_assess' AND (math_proficiency_pct IS NOT NULL OR read_proficiency_pct IS NOT NULL)
-    """)
-    assess_row = cur.fetchone()
-    if assess_row and assess_row[0] is not None:
-        assess_base = max(assess_row[0], assess_row[1] - 3)
-        cur.execute("""
-            WITH base AS (
-                SELECT leaid, math_proficiency_pct, read_proficiency_pct FROM district_data_history
-                WHERE source = 'edfacts_assess' AND year = %s
-            ),
-            latest AS (
-                SELECT leaid, math_proficiency_pct, read_proficiency_pct FROM district_data_history
-                WHERE source = 'edfacts_assess' AND year = %s
-            )
-            UPDATE districts d SET
-                math_proficiency_trend_3yr = CASE
-                    WHEN l.math_proficiency_pct IS NOT NULL AND b.math_proficiency_pct IS NOT NULL
-                    THEN ROUND((l.math_proficiency_pct - b.math_proficiency_pct)::numeric, 2)
-                    ELSE NULL
-                END,
-                read_proficiency_trend_3yr = CASE
-                    WHEN l.read_proficiency_pct IS NOT NULL AND b.read_proficiency_pct IS NOT NULL
-                    THEN ROUND((l.read_proficiency_pct - b.read_proficiency_pct)::numeric, 2)
-                    ELSE NULL
-                END
-            FROM latest l
-            JOIN base b ON l.leaid = b.leaid
-            WHERE d.leaid = l.leaid
-        """, (assess_base, assess_row[1]))
-        print(f"Computed assessment trends for {cur.rowcount} districts")
-
-    # Step 6: Expenditure per pupil trend (% change) from ccd_finance history
-    cur.execute("""
-        SELECT MIN(year), MAX(year) FROM district_data_history
-        WHERE source = 'ccd_finance' AND expenditure_per_pupil IS NOT NULL
-    """)
-    fin_row = cur.fetchone()
-    if fin_row and fin_row[0] is not None:
-        fin_base = max(fin_row[0], fin_row[1] - 3)
-        cur.execute("""
-            WITH base AS (
-                SELECT leaid, expenditure_per_pupil FROM district_data_history
-                WHERE source = 'ccd_finance' AND year = %s
-            ),
-            latest AS (
-                SELECT leaid, expenditure_per_pupil FROM district_data_history
-                WHERE source = 'ccd_finance' AND year = %s
-            )
-            UPDATE districts d SET
-                expenditure_pp_trend_3yr = CASE
-                    WHEN b.expenditure_per_pupil IS NOT NULL AND b.expenditure_per_pupil > 0
-                         AND l.expenditure_per_pupil IS NOT NULL
-                    THEN ROUND(((l.expenditure_per_pupil - b.expenditure_per_pupil) / b.expenditure_per_pupil * 100)::numeric, 2)
-                    ELSE NULL
-                END
-            FROM latest l
-            JOIN base b ON l.leaid = b.leaid
-            WHERE d.leaid = l.leaid
-        """, (fin_base, fin_row[1]))
-        print(f"Computed expenditure trends for {cur.rowcount} districts")
-
-    # Step 7: Absenteeism trend (point change) from crdc_absenteeism history
-    cur.execute("""
-        SELECT MIN(year), MAX(year) FROM district_data_history
-        WHERE source = 'crdc_absenteeism' AND chronic_absenteeism_rate IS NOT NULL
-    """)
-    abs_row = cur.fetchone()
-    if abs_row and abs_row[0] is not None and abs_row[0] != abs_row[1]:
-        # Use two most recent available years (biennial data)
-        cur.execute("""
-            SELECT DISTINCT year FROM district_data_history
-            WHERE source = 'crdc_absenteeism' AND chronic_absenteeism_rate IS NOT NULL
-            ORDER BY year DESC LIMIT 2
-        """)
-        abs_years = [r[0] for r in cur.fetchall()]
-        if len(abs_years) == 2:
-            cur.execute("""
-                WITH base AS (
-                    SELECT leaid, chronic_absenteeism_rate FROM district_data_history
-                    WHERE source = 'crdc_absenteeism' AND year = %s
-                ),
-                latest AS (
-                    SELECT leaid, chronic_absenteeism_rate FROM district_data_history
-                    WHERE source = 'crdc_absenteeism' AND year = %s
-                )
-                UPDATE districts d SET
-                    absenteeism_trend_3yr = ROUND(
-                        (l.chronic_absenteeism_rate - b.chronic_absenteeism_rate)::numeric, 2
-                    )
-                FROM latest l
-                JOIN base b ON l.leaid = b.leaid
-                WHERE d.leaid = l.leaid
-                  AND l.chronic_absenteeism_rate IS NOT NULL
-                  AND b.chronic_absenteeism_rate IS NOT NULL
-            """, (abs_years[1], abs_years[0]))  # [1]=older, [0]=newer
-            print(f"Computed absenteeism trends for {cur.rowcount} districts ({abs_years[1]}→{abs_years[0]})")
+          AND (t.has_ccd OR t.has_grad OR t.has_assess OR t.has_finance OR t.has_abs)
+        RETURNING t.has_ccd, t.has_grad, t.has_assess, t.has_finance, t.has_abs
+    """, (
+        list(periods),
+        [base for base, _ in periods.values()],
+        [latest for _, latest in periods.values()],
+    ))
+    updated = cur.fetchall()
+    ccd_count, grad_count, assess_count, finance_count, abs_count = (
+        sum(1 for flags in updated if flags[i]) for i in range(5)
+    )
+
+    print(f"Computed SWD/ELL/STR trends for {ccd_count} districts")
+    if 'edfacts_grad' in periods:
+        print(f"Computed graduation trends for {grad_count} districts")
+    if 'edfacts_assess' in periods:
+        print(f"Computed assessment trends for {assess_count} districts")
+    if 'ccd_finance' in periods:
+        print(f"Computed expenditure trends for {finance_count} districts")
+    if 'crdc_absenteeism' in periods:
+        abs_base, abs_latest = periods['crdc_absenteeism']
+        print(f"Computed absenteeism trends for {abs_count} districts ({abs_base}→{abs_latest})")
 
     conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
     return pct_count
 
 
-def compute_deltas_and_quartiles(connection_string: str) -> int:
+def compute_deltas_and_quartiles(connection_string: str, conn=None) -> int:
     """
     Compute comparison deltas (vs state, vs national) and quartile flags.
 
@@ -462,54 +373,106 @@ def compute_deltas_and_quartiles(connection_string: str) -> int:
     - below: 50-75% (Q2)
     - well_below: bottom 25% (Q1)
 
+    Runs on conn when given (committing, but leaving it open); otherwise
+    opens its own connection.
+
     Returns:
         Number of districts updated
     """
-    conn = psycopg2.connect(connection_string)
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
 
-    # Step 1: Compute state deltas
+    # Benchmarks are recomputed from scratch on every run, so a lost commit
+    # just means re-running them; don't wait on the WAL flush
+    cur.execute("SET LOCAL synchronous_commit = off")
+    # Keep the quartile NTILE sorts over all districts in memory
+    cur.execute("SET LOCAL work_mem = '256MB'")
+
+    # Steps 1-2: Compute state deltas and national deltas (vs US row) with
+    # one UPDATE, so each district row is rewritten once.
+    # State deltas apply to districts whose state has a states row; national
+    # deltas only to districts that have at least one non-null metric, to
+    # avoid unnecessary writes. A district gets the other set of columns
+    # carried over unchanged.
     cur.execute("""
         UPDATE districts d SET
-            absenteeism_vs_state = ROUND((d.chronic_absenteeism_rate - s.avg_chronic_absenteeism_rate)::numeric, 2),
-            graduation_vs_state = ROUND((d.graduation_rate_total - s.avg_graduation_rate)::numeric, 2),
-            student_teacher_ratio_vs_state = ROUND((d.student_teacher_ratio - s.avg_student_teacher_ratio)::numeric, 2),
-            swd_pct_vs_state = ROUND((d.swd_pct - s.avg_swd_pct)::numeric, 2),
-            ell_pct_vs_state = ROUND((d.ell_pct - s.avg_ell_pct)::numeric, 2),
-            math_proficiency_vs_state = ROUND((d.math_proficiency_pct - s.avg_math_proficiency)::numeric, 2),
-            read_proficiency_vs_state = ROUND((d.read_proficiency_pct - s.avg_read_proficiency)::numeric, 2),
-            expenditure_pp_vs_state = ROUND((d.expenditure_per_pupil - s.avg_expenditure_per_pupil)::numeric, 2)
-        FROM states s
-        WHERE d.state_fips = s.fips
-          AND s.fips != '00'
+            absenteeism_vs_state = CASE WHEN b.has_state
+                THEN ROUND((d.chronic_absenteeism_rate - b.state_avg_chronic_absenteeism_rate)::numeric, 2) ELSE d.absenteeism_vs_state END,
+            graduation_vs_state = CASE WHEN b.has_state
+                THEN ROUND((d.graduation_rate_total - b.state_avg_graduation_rate)::numeric, 2) ELSE d.graduation_vs_state END,
+            student_teacher_ratio_vs_state = CASE WHEN b.has_state
+                THEN ROUND((d.student_teacher_ratio - b.state_avg_student_teacher_ratio)::numeric, 2) ELSE d.student_teacher_ratio_vs_state END,
+            swd_pct_vs_state = CASE WHEN b.has_state
+                THEN ROUND((d.swd_pct - b.state_avg_swd_pct)::numeric, 2) ELSE d.swd_pct_vs_state END,
+            ell_pct_vs_state = CASE WHEN b.has_state
+                THEN ROUND((d.ell_pct - b.state_avg_ell_pct)::numeric, 2) ELSE d.ell_pct_vs_state END,
+            math_proficiency_vs_state = CASE WHEN b.has_state
+                THEN ROUND((d.math_proficiency_pct - b.state_avg_math_proficiency)::numeric, 2) ELSE d.math_proficiency_vs_state END,
+            read_proficiency_vs_state = CASE WHEN b.has_state
+                THEN ROUND((d.read_proficiency_pct - b.state_avg_read_proficiency)::numeric, 2) ELSE d.read_proficiency_vs_state END,
+            expenditure_pp_vs_state = CASE WHEN b.has_state
+                THEN ROUND((d.expenditure_per_pupil - b.state_avg_expenditure_per_pupil)::numeric, 2) ELSE d.expenditure_pp_vs_state END,
+            absenteeism_vs_national = CASE WHEN b.has_national
+                THEN ROUND((d.chronic_absenteeism_rate - b.us_avg_chronic_absenteeism_rate)::numeric, 2) ELSE d.absenteeism_vs_national END,
+            graduation_vs_national = CASE WHEN b.has_national
+                THEN ROUND((d.graduation_rate_total - b.us_avg_graduation_rate)::numeric, 2) ELSE d.graduation_vs_national END,
+            student_teacher_ratio_vs_national = CASE WHEN b.has_national
+                THEN ROUND((d.student_teacher_ratio - b.us_avg_student_teacher_ratio)::numeric, 2) ELSE d.student_teacher_ratio_vs_national END,
+            swd_pct_vs_national = CASE WHEN b.has_national
+                THEN ROUND((d.swd_pct - b.us_avg_swd_pct)::numeric, 2) ELSE d.swd_pct_vs_national END,
+            ell_pct_vs_national = CASE WHEN b.has_national
+                THEN ROUND((d.ell_pct - b.us_avg_ell_pct)::numeric, 2) ELSE d.ell_pct_vs_national END,
+            math_proficiency_vs_national = CASE WHEN b.has_national
+                THEN ROUND((d.math_proficiency_pct - b.us_avg_math_proficiency)::numeric, 2) ELSE d.math_proficiency_vs_national END,
+            read_proficiency_vs_national = CASE WHEN b.has_national
+                THEN ROUND((d.read_proficiency_pct - b.us_avg_read_proficiency)::numeric, 2) ELSE d.read_proficiency_vs_national END,
+            expenditure_pp_vs_national = CASE WHEN b.has_national
+                THEN ROUND((d.expenditure_per_pupil - b.us_avg_expenditure_per_pupil)::numeric, 2) ELSE d.expenditure_pp_vs_national END
+        FROM (
+            SELECT
+                src.leaid,
+                s.fips IS NOT NULL AS has_state,
+                us.fips IS NOT NULL
+                  AND (
+                       src.chronic_absenteeism_rate IS NOT NULL
+                       OR src.graduation_rate_total IS NOT NULL
+                       OR src.student_teacher_ratio IS NOT NULL
+                       OR src.swd_pct IS NOT NULL
+                       OR src.ell_pct IS NOT NULL
+                       OR src.math_proficiency_pct IS NOT NULL
+                       OR src.read_proficiency_pct IS NOT NULL
+                       OR src.expenditure_per_pupil IS NOT NULL
+                  ) AS has_national,
+                s.avg_chronic_absenteeism_rate AS state_avg_chronic_absenteeism_rate,
+                s.avg_graduation_rate AS state_avg_graduation_rate,
+                s.avg_student_teacher_ratio AS state_avg_student_teacher_ratio,
+                s.avg_swd_pct AS state_avg_swd_pct,
+                s.avg_ell_pct AS state_avg_ell_pct,
+                s.avg_math_proficiency AS state_avg_math_proficiency,
+                s.avg_read_proficiency AS state_avg_read_proficiency,
+                s.avg_expenditure_per_pupil AS state_avg_expenditure_per_pupil,
+                us.avg_chronic_absenteeism_rate AS us_avg_chronic_absenteeism_rate,
+                us.avg_graduation_rate AS us_avg_graduation_rate,
+                us.avg_student_teacher_ratio AS us_avg_student_teacher_ratio,
+                us.avg_swd_pct AS us_avg_swd_pct,
+                us.avg_ell_pct AS us_avg_ell_pct,
+                us.avg_math_proficiency AS us_avg_math_proficiency,
+                us.avg_read_proficiency AS us_avg_read_proficiency,
+                us.avg_expenditure_per_pupil AS us_avg_expenditure_per_pupil
+            FROM districts src
+            LEFT JOIN states s ON s.fips = src.state_fips AND s.fips != '00'
+            LEFT JOIN states us ON us.fips = '00'
+        ) b
+        WHERE d.leaid = b.leaid
+          AND (b.has_state OR b.has_national)
+        RETURNING b.has_state, b.has_national
     """)
-    state_delta_count = cur.rowcount
+    updated = cur.fetchall()
+    state_delta_count = sum(1 for has_state, _ in updated if has_state)
+    national_delta_count = sum(1 for _, has_national in updated if has_national)
     print(f"Computed state deltas for {state_delta_count} districts")
-
-    # Step 2: Compute national deltas (vs US row)
-    # Only update districts that have at least one non-null metric to avoid unnecessary writes
-    cur.execute("""
-        UPDATE districts d SET
-            absenteeism_vs_national = ROUND((d.chronic_absenteeism_rate - us.avg_chronic_absenteeism_rate)::numeric, 2),
-            graduation_vs_national = ROUND((d.graduation_rate_total - us.avg_graduation_rate)::numeric, 2),
-            student_teacher_ratio_vs_national = ROUND((d.student_teacher_ratio - us.avg_student_teacher_ratio)::numeric, 2),
-            swd_pct_vs_national = ROUND((d.swd_pct - us.avg_swd_pct)::numeric, 2),
-            ell_pct_vs_national = ROUND((d.ell_pct - us.avg_ell_pct)::numeric, 2),
-            math_proficiency_vs_national = ROUND((d.math_proficiency_pct - us.avg_math_proficiency)::numeric, 2),
-            read_proficiency_vs_national = ROUND((d.read_proficiency_pct - us.avg_read_proficiency)::numeric, 2),
-            expenditure_pp_vs_national = ROUND((d.expenditure_per_pupil - us.avg_expenditure_per_pupil)::numeric, 2)
-        FROM states us
-        WHERE us.fips = '00'
-          AND (d.chronic_absenteeism_rate IS NOT NULL
-               OR d.graduation_rate_total IS NOT NULL
-               OR d.student_teacher_ratio IS NOT NULL
-               OR d.swd_pct IS NOT NULL
-               OR d.ell_pct IS NOT NULL
-               OR d.math_proficiency_pct IS NOT NULL
-               OR d.read_proficiency_pct IS NOT NULL
-               OR d.expenditure_per_pupil IS NOT NULL)
-    """)
-    national_delta_count = cur.rowcount
     print(f"Computed national deltas for {national_delta_count} districts")
 
     # Step 3: Compute within-state quartile flags
@@ -529,44 +492,47 @@ def compute_deltas_and_quartiles(connection_string: str) -> int:
         ("expenditure_per_pupil", "expenditure_pp_quartile_state", False),
     ]
 
-    for metric_col, quartile_col, higher_is_better in METRICS:
-        # Reset stale quartile values for districts that no longer have data
-        cur.execute(f"""
-            UPDATE districts SET {quartile_col} = NULL
-            WHERE {metric_col} IS NULL OR state_fips IS NULL
-        """)
-
+    # All metrics are ranked in one pass and written with one UPDATE. Each
+    # metric only ranks districts in the state that have a value for it:
+    # partitioning on "{metric} IS NULL" as well keeps the others out of its
+    # tiles, and their quartile is reset to NULL along with districts that
+    # have no state.
+    ranks = []
+    sets = []
+    for i, (metric_col, quartile_col, higher_is_better) in enumerate(METRICS):
         # Sort direction determines what "well_above" means:
         # higher_is_better=True: ASC sort → Q4 = highest values = best performing
         # higher_is_better=False: DESC sort → Q4 = lowest values = best performing
         sort_dir = "ASC" if higher_is_better else "DESC"
-
-        cur.execute(f"""
-            WITH ranked AS (
-                SELECT leaid,
-                    NTILE(4) OVER (
-                        PARTITION BY state_fips
-                        ORDER BY {metric_col} {sort_dir} NULLS LAST
-                    ) AS quartile
-                FROM districts
-                WHERE {metric_col} IS NOT NULL
-                  AND state_fips IS NOT NULL
-            )
-            UPDATE districts d SET
-                {quartile_col} = CASE r.quartile
-                    WHEN 4 THEN 'well_above'
-                    WHEN 3 THEN 'above'
-                    WHEN 2 THEN 'below'
-                    WHEN 1 THEN 'well_below'
-                END
-            FROM ranked r
-            WHERE d.leaid = r.leaid
-        """)
-        print(f"  {quartile_col}: {cur.rowcount} districts ranked")
+        ranks.append(f"""
+                {metric_col} IS NOT NULL AND state_fips IS NOT NULL AS ranked_{i},
+                NTILE(4) OVER (
+                    PARTITION BY state_fips, {metric_col} IS NULL
+                    ORDER BY {metric_col} {sort_dir} NULLS LAST
+                ) AS quartile_{i}""")
+        sets.append(f"""
+            {quartile_col} = CASE WHEN r.ranked_{i} THEN (
+                ARRAY['well_below', 'below', 'above', 'well_above']
+            )[r.quartile_{i}] END""")
+
+    cur.execute(f"""
+        WITH ranked AS (
+            SELECT leaid,{",".join(ranks)}
+            FROM districts
+        )
+        UPDATE districts d SET{",".join(sets)}
+        FROM ranked r
+        WHERE d.leaid = r.leaid
+        RETURNING {", ".join(f"r.ranked_{i}" for i in range(len(METRICS)))}
+    """)
+    updated = cur.fetchall()
+    for i, (_, quartile_col, _) in enumerate(METRICS):
+        print(f"  {quartile_col}: {sum(1 for flags in updated if flags[i])} districts ranked")
 
     conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
     return state_delta_count
 
 
@@ -581,27 +547,36 @@ def compute_all_benchmarks(connection_string: str) -> Dict:
     print("Computing District Benchmarks & Trends")
     print("=" * 60)
 
-    print("\n--- Step 1: State & National Averages ---")
-    avg_count = compute_state_averages(connection_string)
+    # One connection for every step and the run log
+    conn = psycopg2.connect(connection_string)
+    try:
+        print("\n--- Step 1: State & National Averages ---")
+        avg_count = compute_state_averages(connection_string, conn=conn)
 
-    print("\n--- Step 2: District Trends ---")
-    trend_count = compute_district_trends(connection_string)
+        print("\n--- Step 2: District Trends ---")
+        trend_count = compute_district_trends(connection_string, conn=conn)
 
-    print("\n--- Step 3: Deltas & Quartiles ---")
-    delta_count = compute_deltas_and_quartiles(connection_string)
+        print("\n--- Step 3: Deltas & Quartiles ---")
+        delta_count = compute_deltas_and_quartiles(connection_string, conn=conn)
 
-    # Log to data_refresh_logs
-    conn = psycopg2.connect(connection_string)
-    cur = conn.cursor()
-    cur.execute("""
-        INSERT INTO data_refresh_logs (
-            data_source, records_updated, records_failed,
-            status, started_at, completed_at
-        ) VALUES ('compute_benchmarks', %s, 0, 'success', NOW(), NOW())
-    """, (trend_count + delta_count,))
-    conn.commit()
-    cur.close()
-    conn.close()
+        cur = conn.cursor()
+
+        # Every benchmark column was just rewritten; refresh planner stats
+        # now rather than waiting for autovacuum to get to them
+        cur.execute("ANALYZE states")
+        cur.execute("ANALYZE districts")
+
+        # Log to data_refresh_logs
+        cur.execute("""
+            INSERT INTO data_refresh_logs (
+                data_source, records_updated, records_failed,
+                status, started_at, completed_at
+            ) VALUES ('compute_benchmarks', %s, 0, 'success', NOW(), NOW())
+        """, (trend_count + delta_count,))
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
 
     return {
         "state_averages": avg_count,
@@ -639,12 +614,16 @@ def main():
         result = compute_all_benchmarks(connection_string)
         print(f"\nBenchmark computation complete: {result}")
     else:
-        if args.averages:
-            compute_state_averages(connection_string)
-        if args.trends:
-            compute_district_trends(connection_string)
-        if args.deltas:
-            compute_deltas_and_quartiles(connection_string)
+        conn = psycopg2.connect(connection_string)
+        try:
+            if args.averages:
+                compute_state_averages(connection_string, conn=conn)
+            if args.trends:
+                compute_district_trends(connection_string, conn=conn)
+            if args.deltas:
+                compute_deltas_and_quartiles(connection_string, conn=conn)
+        finally:
+            conn.close()
 
 
 if __name__ == "__main__":
@@ -9,8 +9,10 @@ Uses leaid + email as a unique key for upserting.
 
 import os
 import csv
+import io
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 import psycopg2
 from psycopg2.extras import execute_values
 from tqdm import tqdm
@@ -34,79 +36,127 @@ CSV_COLUMNS = {
     "Seniorty Level": "seniority_level",  # Note typo in source CSV
 }
 
+# Columns of the unmatched contacts report
+UNMATCHED_COLUMNS = (
+    "name", "email", "title", "leaid_raw", "match_failure_reason",
+    "persona", "seniority_level", "linkedin_url",
+)
 
-def parse_csv_row(row: Dict[str, str]) -> Dict:
+# Contact columns a CSV row overwrites when it matches an existing contact
+UPDATE_COLUMNS = (
+    "salutation", "name", "title", "email",
+    "linkedin_url", "persona", "seniority_level",
+)
+
+
+def parse_csv_row(row: List[Optional[str]], idx: List[Tuple[int, str]]) -> Dict:
     """
     Parse a CSV row into a normalized contact record.
-    """
-    record = {}
 
-    # Map columns
-    for csv_col, internal_col in CSV_COLUMNS.items():
-        value = row.get(csv_col, "")
-        # Clean up whitespace
-        if isinstance(value, str):
-            value = value.strip()
-        record[internal_col] = value if value else None
+    idx pairs each CSV_COLUMNS position in row with its internal name.
+    """
+    # Map columns, stripping whitespace; empty values and the None padding
+    # of short rows both become None
+    record = {
+        internal_col: (row[pos].strip() or None) if row[pos] else None
+        for pos, internal_col in idx
+    }
 
-    # Normalize LEAID
-    record["leaid_raw"] = record.get("leaid")
-    record["leaid"] = normalize_leaid(record.get("leaid"))
+    # Normalize LEAID. Most already are 7 digits, which normalize_leaid
+    # would return unchanged (the value is already stripped)
+    leaid_raw = record["leaid"]
+    record["leaid_raw"] = leaid_raw
+    if leaid_raw is not None and len(leaid_raw) == 7 and leaid_raw.isdigit():
+        record["leaid"] = leaid_raw
+    else:
+        record["leaid"] = normalize_leaid(leaid_raw)
 
     return record
 
 
-def load_contacts_csv(csv_path: Path) -> List[Dict]:
+def iter_contacts_csv(csv_path: Path) -> Iterator[Dict]:
     """
-    Load and parse the Contacts CSV file.
+    Parse the Contacts CSV file, yielding records as they are read.
 
     Args:
         csv_path: Path to the CSV file
 
-    Returns:
-        List of parsed contact records
+    Yields:
+        Parsed contact records
     """
-    records = []
+    parsed = 0
 
     with open(csv_path, "r", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, [])
+        width = len(header)
+
+        # Resolve column positions once; rows are cut or padded with None to
+        # just past the header, and a column missing from it points into
+        # that padding
+        positions = {name: i for i, name in enumerate(header)}
+        idx = [
+            (positions.get(csv_col, width), internal_col)
+            for csv_col, internal_col in CSV_COLUMNS.items()
+        ]
+        pad = [None] * (width + 1)
+
         for row in tqdm(reader, desc="Parsing CSV"):
-            record = parse_csv_row(row)
+            if not row:
+                # Skip blank lines
+                continue
+            del row[width:]
+            row += pad[len(row):]
+            record = parse_csv_row(row, idx)
             # Skip records with no name
             if record.get("name"):
-                records.append(record)
+                parsed += 1
+                yield record
 
-    print(f"Parsed {len(records)} contact records from CSV")
-    return records
+    print(f"Parsed {parsed} contact records from CSV")
 
 
-def get_valid_leaids(connection_string: str) -> set:
-    """Get set of valid LEAIDs from districts table."""
-    conn = psycopg2.connect(connection_string)
+def get_valid_leaids(connection_string: str, conn=None) -> set:
+    """
+    Get set of valid LEAIDs from districts table.
+
+    Runs on conn when given (ending its transaction, but leaving it open);
+    otherwise opens its own connection.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
     cur.execute("SELECT leaid FROM districts")
-    leaids = {row[0] for row in cur.fetchall()}
+    leaids = {leaid for (leaid,) in cur}
+    conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
     return leaids
 
 
 def categorize_records(
-    records: List[Dict],
-    valid_leaids: set
-) -> Tuple[List[Dict], List[Dict]]:
+    records: Iterable[Dict],
+    valid_leaids: set,
+    unmatched_writer,
+) -> Tuple[List[Dict], Counter]:
     """
     Categorize records into matched and unmatched.
 
+    Unmatched records are written out as they are found rather than kept.
+
     Args:
-        records: All parsed records
+        records: All parsed records (any iterable, consumed once)
         valid_leaids: Set of valid LEAIDs from districts table
+        unmatched_writer: csv.writer for the unmatched contacts report,
+            which gets one UNMATCHED_COLUMNS row per unmatched record
 
     Returns:
-        Tuple of (matched_records, unmatched_records)
+        Tuple of (matched_records, unmatched count per failure reason)
     """
     matched = []
-    unmatched = []
+    failure_reasons = Counter()
 
     for record in records:
         leaid = record["leaid"]
@@ -115,42 +165,62 @@ def categorize_records(
         if leaid is None:
             # No LEAID or invalid format
             if not leaid_raw or leaid_raw.strip() == "":
-                record["match_failure_reason"] = "no_leaid"
+                reason = "no_leaid"
             else:
-                record["match_failure_reason"] = "invalid_leaid"
-            unmatched.append(record)
+                reason = "invalid_leaid"
         elif leaid not in valid_leaids:
             # Valid format but not in districts table
-            record["match_failure_reason"] = "leaid_not_found"
-            unmatched.append(record)
+            reason = "leaid_not_found"
         else:
             matched.append(record)
+            continue
 
-    return matched, unmatched
+        failure_reasons[reason] += 1
+        unmatched_writer.writerow((
+            record["name"],
+            record["email"],
+            record["title"],
+            leaid_raw,
+            reason,
+            record["persona"],
+            record["seniority_level"],
+            record["linkedin_url"],
+        ))
+
+    return matched, failure_reasons
 
 
 def upsert_contacts(
     connection_string: str,
     records: List[Dict],
-    batch_size: int = 500
+    batch_size: int = 500,
+    conn=None,
 ) -> int:
     """
     Upsert contacts into the contacts table.
 
     Uses (leaid, email) as the unique key for deduplication.
     For contacts without email, uses (leaid, name) as fallback.
+
+    Runs on conn when given (committing, but leaving it open); otherwise
+    opens its own connection.
     """
     if not records:
         return 0
 
-    conn = psycopg2.connect(connection_string)
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
 
-    # Track existing contacts by (leaid, email) and (leaid, name)
+    # Track existing contacts by (leaid, email) and (leaid, name). Records
+    # only ever match contacts in their own district, so only the districts
+    # being imported are fetched
     print("Fetching existing contacts...")
     cur.execute("""
         SELECT id, leaid, email, name FROM contacts
-    """)
+        WHERE leaid = ANY(%s)
+    """, (list({r["leaid"] for r in records}),))
     existing_by_email = {}  # (leaid, email) -> id
     existing_by_name = {}   # (leaid, name) -> id
     for row in cur.fetchall():
@@ -159,40 +229,34 @@ def upsert_contacts(
             existing_by_email[(leaid, email.lower())] = contact_id
         existing_by_name[(leaid, name.lower())] = contact_id
 
-    # Categorize records for insert vs update
-    to_insert = []
+    # Categorize records for insert vs update in one pass, deduplicating
+    # inserts by (leaid, email) or (leaid, name); the first record wins
+    deduped_inserts = []
     to_update = []
+    seen = set()
 
     for r in records:
         leaid = r["leaid"]
         email = r.get("email")
         name = r.get("name", "")
+        email_lc = email.lower() if email else None
+        name_lc = name.lower() if name else None
 
         # Try to match by email first, then by name
         existing_id = None
-        if email:
-            existing_id = existing_by_email.get((leaid, email.lower()))
-        if existing_id is None and name:
-            existing_id = existing_by_name.get((leaid, name.lower()))
+        if email_lc:
+            existing_id = existing_by_email.get((leaid, email_lc))
+        if existing_id is None and name_lc:
+            existing_id = existing_by_name.get((leaid, name_lc))
 
         if existing_id:
             r["id"] = existing_id
             to_update.append(r)
         else:
-            to_insert.append(r)
-
-    # Deduplicate inserts by (leaid, email) or (leaid, name)
-    seen = set()
-    deduped_inserts = []
-    for r in to_insert:
-        leaid = r["leaid"]
-        email = r.get("email")
-        name = r.get("name", "")
-
-        key = (leaid, email.lower()) if email else (leaid, name.lower())
-        if key not in seen:
-            seen.add(key)
-            deduped_inserts.append(r)
+            key = (leaid, email_lc) if email_lc else (leaid, name_lc)
+            if key not in seen:
+                seen.add(key)
+                deduped_inserts.append(r)
 
     print(f"Contacts to insert: {len(deduped_inserts)}, to update: {len(to_update)}")
 
@@ -220,88 +284,100 @@ def upsert_contacts(
             for r in deduped_inserts
         ]
 
+        # One multi-row INSERT per batch_size contacts (execute_values defaults
+        # to splitting every call into 100-row statements)
         print(f"Inserting {len(values)} new contacts...")
-        for i in tqdm(range(0, len(values), batch_size), desc="Inserting"):
-            batch = values[i:i+batch_size]
-            execute_values(cur, insert_sql, batch)
+        execute_values(cur, insert_sql, values, page_size=batch_size)
 
     # Update existing contacts
     if to_update:
         print(f"Updating {len(to_update)} existing contacts...")
-        for r in tqdm(to_update, desc="Updating"):
-            cur.execute("""
-                UPDATE contacts SET
-                    salutation = COALESCE(%s, salutation),
-                    name = %s,
-                    title = COALESCE(%s, title),
-                    email = COALESCE(%s, email),
-                    linkedin_url = COALESCE(%s, linkedin_url),
-                    persona = COALESCE(%s, persona),
-                    seniority_level = COALESCE(%s, seniority_level)
-                WHERE id = %s
-            """, (
-                r.get("salutation"),
-                r["name"],
-                r.get("title"),
-                r.get("email"),
-                r.get("linkedin_url"),
-                r.get("persona"),
-                r.get("seniority_level"),
-                r["id"],
-            ))
+
+        # A contact matched by several CSV rows gets them merged as if they
+        # were applied in order: name is always set, and every other column
+        # keeps its last non-empty value (else the stored one, via COALESCE)
+        updates = {}
+        for r in to_update:
+            merged = updates.setdefault(r["id"], {})
+            for col in UPDATE_COLUMNS:
+                value = r.get(col)
+                if value is not None:
+                    merged[col] = value
+
+        # Stage the updates so they apply as one UPDATE ... FROM
+        cur.execute("""
+            CREATE TEMP TABLE contact_updates (
+                id INTEGER PRIMARY KEY,
+                salutation TEXT,
+                name TEXT,
+                title TEXT,
+                email TEXT,
+                linkedin_url TEXT,
+                persona TEXT,
+                seniority_level TEXT
+            )
+        """)
+
+        buf = io.StringIO()
+        csv.writer(buf).writerows(
+            [contact_id] + [merged.get(col) for col in UPDATE_COLUMNS]
+            for contact_id, merged in updates.items()
+        )
+        buf.seek(0)
+        cur.copy_expert(f"""
+            COPY contact_updates (id, {", ".join(UPDATE_COLUMNS)})
+            FROM STDIN WITH (FORMAT csv)
+        """, buf)
+
+        cur.execute("""
+            UPDATE contacts SET
+                salutation = COALESCE(u.salutation, contacts.salutation),
+                name = u.name,
+                title = COALESCE(u.title, contacts.title),
+                email = COALESCE(u.email, contacts.email),
+                linkedin_url = COALESCE(u.linkedin_url, contacts.linkedin_url),
+                persona = COALESCE(u.persona, contacts.persona),
+                seniority_level = COALESCE(u.seniority_level, contacts.seniority_level)
+            FROM contact_updates u
+            WHERE contacts.id = u.id
+        """)
+
+        cur.execute("DROP TABLE contact_updates")
 
     conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
 
     return len(deduped_inserts) + len(to_update)
 
 
 def generate_match_report(
-    matched: List[Dict],
-    unmatched: List[Dict],
+    matched_count: int,
+    failure_reasons: Dict[str, int],
     output_dir: Path
 ) -> Dict:
     """
-    Generate match report files.
+    Generate the match summary report.
 
-    Creates:
-    - unmatched_contacts.csv: List of unmatched contacts
-    - contacts_match_summary.json: Summary statistics
+    Creates contacts_match_summary.json with summary statistics;
+    unmatched_contacts.csv is written by categorize_records.
     """
     import json
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Write unmatched CSV
-    unmatched_csv = output_dir / "unmatched_contacts.csv"
-    with open(unmatched_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            "name", "email", "title", "leaid_raw", "match_failure_reason",
-            "persona", "seniority_level", "linkedin_url",
-        ])
-        writer.writeheader()
-        for r in unmatched:
-            writer.writerow({k: r.get(k, "") for k in writer.fieldnames})
-
-    print(f"Wrote unmatched contacts to {unmatched_csv}")
-
     # Calculate summary
-    total = len(matched) + len(unmatched)
-    match_rate = len(matched) / total * 100 if total > 0 else 0
-
-    # Breakdown by failure reason
-    failure_reasons = {}
-    for r in unmatched:
-        reason = r.get("match_failure_reason", "unknown")
-        failure_reasons[reason] = failure_reasons.get(reason, 0) + 1
+    unmatched_count = sum(failure_reasons.values())
+    total = matched_count + unmatched_count
+    match_rate = matched_count / total * 100 if total > 0 else 0
 
     summary = {
         "total_records": total,
-        "matched_count": len(matched),
-        "unmatched_count": len(unmatched),
+        "matched_count": matched_count,
+        "unmatched_count": unmatched_count,
         "match_rate_percent": round(match_rate, 2),
-        "failure_reasons": failure_reasons,
+        "failure_reasons": dict(failure_reasons),
     }
 
     # Write summary JSON
@@ -344,25 +420,38 @@ def main():
     if not csv_path.exists():
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
 
-    # Load and parse CSV
-    records = load_contacts_csv(csv_path)
-
-    # Get valid LEAIDs
-    print("Fetching valid LEAIDs from database...")
-    valid_leaids = get_valid_leaids(connection_string)
-    print(f"Found {len(valid_leaids)} valid district LEAIDs")
+    output_dir = Path(args.output_dir)
 
-    # Categorize
-    matched, unmatched = categorize_records(records, valid_leaids)
-    print(f"Matched: {len(matched)}, Unmatched: {len(unmatched)}")
+    # One connection for the LEAID lookup and the upsert
+    conn = psycopg2.connect(connection_string)
+    try:
+        # Get valid LEAIDs
+        print("Fetching valid LEAIDs from database...")
+        valid_leaids = get_valid_leaids(connection_string, conn=conn)
+        print(f"Found {len(valid_leaids)} valid district LEAIDs")
+
+        # Parse and categorize in one pass, without holding every parsed
+        # record; unmatched ones go straight to the report CSV
+        output_dir.mkdir(parents=True, exist_ok=True)
+        unmatched_csv = output_dir / "unmatched_contacts.csv"
+        with open(unmatched_csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(UNMATCHED_COLUMNS)
+            matched, failure_reasons = categorize_records(
+                iter_contacts_csv(csv_path), valid_leaids, writer
+            )
+        unmatched_count = sum(failure_reasons.values())
+        print(f"Matched: {len(matched)}, Unmatched: {unmatched_count}")
+        print(f"Wrote unmatched contacts to {unmatched_csv}")
 
-    # Upsert contacts
-    upserted_count = upsert_contacts(connection_string, matched)
-    print(f"Upserted {upserted_count} contacts")
+        # Upsert contacts
+        upserted_count = upsert_contacts(connection_string, matched, conn=conn)
+        print(f"Upserted {upserted_count} contacts")
+    finally:
+        conn.close()
 
     # Generate report
-    output_dir = Path(args.output_dir)
-    generate_match_report(matched, unmatched, output_dir)
+    generate_match_report(len(matched), failure_reasons, output_dir)
 
 
 if __name__ == "__main__":
@@ -20,10 +20,35 @@ CSV Downloads:
 
 import os
 import csv
+import io
 import argparse
+from functools import lru_cache
 from typing import Dict, List, Optional
-from collections import defaultdict
-from tqdm import tqdm
+
+
+# CSV columns each loader reads
+FINANCE_CSV_COLUMNS = (
+    'leaid', 'year', 'exp_total', 'enrollment_fall_responsible', 'rev_arp_esser',
+    'rev_cares_act_relief_esser', 'rev_crrsa_esser_ii', 'exp_tech_supplies_services',
+    'exp_tech_equipment', 'rev_total', 'salaries_total', 'rev_fed_total',
+    'rev_state_total', 'rev_local_total', 'salaries_instruction',
+    'salaries_teachers_regular_prog', 'salaries_teachers_sped',
+    'salaries_teachers_vocational', 'salaries_teachers_other_ed',
+    'salaries_supp_sch_admin', 'salaries_supp_instruc_staff', 'benefits_employee_total',
+    'exp_sped_current', 'exp_sped_instruction', 'exp_sped_pupil_support_services',
+    'exp_cares_act_outlay', 'exp_cares_act_instruction', 'payments_charter_schools',
+    'payments_private_schools', 'exp_capital_outlay_total',
+    'debt_longterm_outstand_end_fy',
+)
+
+ABSENTEEISM_CSV_COLUMNS = (
+    'leaid', 'sex', 'race', 'disability', 'year', 'chronic_absent', 'enrollment_crdc',
+)
+
+ASSESSMENT_CSV_COLUMNS = (
+    'leaid', 'race', 'sex', 'year', 'math_test_pct_prof_midpt',
+    'read_test_pct_prof_midpt',
+)
 
 
 def _clean_val(val):
@@ -47,9 +72,72 @@ def _clean_int(val):
     return None
 
 
+@lru_cache(maxsize=None)
+def _leaid_str(leaid: str) -> str:
+    """
+    Zero-padded 7-digit LEAID from a CSV value such as '100005.0'.
+
+    Cached, since school-level files repeat each district's LEAID on
+    thousands of rows.
+    """
+    return str(int(float(leaid))).zfill(7)
+
+
+@lru_cache(maxsize=None)
+def _is_total(val) -> bool:
+    """
+    Whether a disaggregation code (sex, race, disability) is 99, the total.
+
+    Cached: the codes take a handful of distinct values, and most rows of
+    school-level files are breakdowns that get skipped on the first code.
+    """
+    return _clean_int(val) == 99
+
+
+def _read_csv_rows(f, columns):
+    """
+    Read CSV rows from f as lists, with the position of each named column.
+
+    Rows are cut or padded with None to one field past the header, so every
+    position is valid. A column missing from the header gets that last
+    position, where every row is padding, so it reads as None the way
+    DictReader's row.get() did.
+
+    Returns:
+        Tuple of ({column: position}, iterator over rows)
+    """
+    reader = csv.reader(f)
+    header = next(reader, [])
+    width = len(header)
+    # Later duplicate header names win, as with DictReader
+    positions = {name: i for i, name in enumerate(header)}
+    col = {name: positions.get(name, width) for name in columns}
+    pad = [None] * (width + 1)
+
+    def rows():
+        for row in reader:
+            if not row:
+                # DictReader skipped blank lines
+                continue
+            del row[width:]
+            row += pad[len(row):]
+            yield row
+
+    return col, rows()
+
+
+def _copy_rows(cur, table: str, rows) -> None:
+    """COPY rows (tuples, None for NULL) into table in one round trip."""
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} FROM STDIN WITH (FORMAT csv)", buf)
+
+
 def load_finance_csv(
     connection_string: str,
     csv_path: str,
+    conn=None,
 ) -> dict:
     """
     Load finance data from a bulk CSV download.
@@ -60,12 +148,13 @@ def load_finance_csv(
     Args:
         connection_string: PostgreSQL connection string
         csv_path: Path to finance CSV from Urban Institute Data Explorer
+        conn: Connection to run on, committed but left open; a new one is
+            opened when omitted
 
     Returns:
         Dict with counts
     """
     import psycopg2
-    from psycopg2.extras import execute_values
 
     print(f"Reading finance CSV: {csv_path}")
 
@@ -73,79 +162,79 @@ def load_finance_csv(
     year = None
 
     with open(csv_path, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
+        col, rows = _read_csv_rows(f, FINANCE_CSV_COLUMNS)
 
-        for row in reader:
-            leaid = row.get('leaid')
+        for row in rows:
+            leaid = row[col['leaid']]
             if not leaid:
                 continue
 
-            leaid_str = str(int(float(leaid))).zfill(7) if leaid else None
+            leaid_str = _leaid_str(leaid) if leaid else None
             if not leaid_str or len(leaid_str) != 7:
                 continue
 
             if year is None:
-                year = _clean_int(row.get('year'))
+                year = _clean_int(row[col['year']])
 
-            exp_total = _clean_val(row.get('exp_total'))
-            enrollment = _clean_val(row.get('enrollment_fall_responsible'))
+            exp_total = _clean_val(row[col['exp_total']])
+            enrollment = _clean_val(row[col['enrollment_fall_responsible']])
             exp_per_pupil = None
             if exp_total and enrollment and enrollment > 0:
                 exp_per_pupil = round(exp_total / enrollment, 2)
 
             # ESSER components
-            rev_arp = _clean_val(row.get('rev_arp_esser'))
-            rev_cares = _clean_val(row.get('rev_cares_act_relief_esser'))
-            rev_crrsa = _clean_val(row.get('rev_crrsa_esser_ii'))
+            rev_arp = _clean_val(row[col['rev_arp_esser']])
+            rev_cares = _clean_val(row[col['rev_cares_act_relief_esser']])
+            rev_crrsa = _clean_val(row[col['rev_crrsa_esser_ii']])
             esser_parts = [v for v in [rev_arp, rev_cares, rev_crrsa] if v is not None]
             esser_funding = sum(esser_parts) if esser_parts else None
 
             # Tech spending
-            tech_supplies = _clean_val(row.get('exp_tech_supplies_services'))
-            tech_equip = _clean_val(row.get('exp_tech_equipment'))
+            tech_supplies = _clean_val(row[col['exp_tech_supplies_services']])
+            tech_equip = _clean_val(row[col['exp_tech_equipment']])
             tech_parts = [v for v in [tech_supplies, tech_equip] if v is not None]
             tech_spending = sum(tech_parts) if tech_parts else None
 
-            rev_total = _clean_val(row.get('rev_total'))
-            salaries_total = _clean_val(row.get('salaries_total'))
+            rev_total = _clean_val(row[col['rev_total']])
+            salaries_total = _clean_val(row[col['salaries_total']])
 
             if rev_total is not None or salaries_total is not None:
                 records.append((
                     leaid_str,
                     # Revenue
                     rev_total,
-                    _clean_val(row.get('rev_fed_total')),
-                    _clean_val(row.get('rev_state_total')),
-                    _clean_val(row.get('rev_local_total')),
+                    _clean_val(row[col['rev_fed_total']]),
+                    _clean_val(row[col['rev_state_total']]),
+                    _clean_val(row[col['rev_local_total']]),
                     # Expenditure
                     exp_total,
                     exp_per_pupil,
                     year,
                     # Salaries
                     salaries_total,
-                    _clean_val(row.get('salaries_instruction')),
-                    _clean_val(row.get('salaries_teachers_regular_prog')),
-                    _clean_val(row.get('salaries_teachers_sped')),
-                    _clean_val(row.get('salaries_teachers_vocational')),
-                    _clean_val(row.get('salaries_teachers_other_ed')),
-                    _clean_val(row.get('salaries_supp_sch_admin')),
-                    _clean_val(row.get('salaries_supp_instruc_staff')),
-                    _clean_val(row.get('benefits_employee_total')),
+                    _clean_val(row[col['salaries_instruction']]),
+                    _clean_val(row[col['salaries_teachers_regular_prog']]),
+                    _clean_val(row[col['salaries_teachers_sped']]),
+                    _clean_val(row[col['salaries_teachers_vocational']]),
+                    _clean_val(row[col['salaries_teachers_other_ed']]),
+                    _clean_val(row[col['salaries_supp_sch_admin']]),
+                    _clean_val(row[col['salaries_supp_instruc_staff']]),
+                    _clean_val(row[col['benefits_employee_total']]),
                     # SpEd finance (NEW)
-                    _clean_val(row.get('exp_sped_current')),
-                    _clean_val(row.get('exp_sped_instruction')),
-                    _clean_val(row.get('exp_sped_pupil_support_services')),
+                    _clean_val(row[col['exp_sped_current']]),
+                    _clean_val(row[col['exp_sped_instruction']]),
+                    _clean_val(row[col['exp_sped_pupil_support_services']]),
                     # ESSER (NEW)
                     esser_funding,
-                    _clean_val(row.get('exp_cares_act_outlay')),
-                    _clean_val(row.get('exp_cares_act_instruction')),
+                    _clean_val(row[col['exp_cares_act_outlay']]),
+                    _clean_val(row[col['exp_cares_act_instruction']]),
                     # Outsourcing (NEW)
-                    _clean_val(row.get('payments_charter_schools')),
-                    _clean_val(row.get('payments_private_schools')),
+                    _clean_val(row[col['payments_charter_schools']]),
+                    _clean_val(row[col['payments_private_schools']]),
                     # Tech & capital (NEW)
                     tech_spending,
-                    _clean_val(row.get('exp_capital_outlay_total')),
-                    _clean_val(row.get('debt_longterm_outstand_end_fy')),
+                    _clean_val(row[col['exp_capital_outlay_total']]),
+                    _clean_val(row[col['debt_longterm_outstand_end_fy']]),
                 ))
 
     print(f"Parsed {len(records)} finance records from CSV (year: {year})")
@@ -154,9 +243,17 @@ def load_finance_csv(
         print("No valid records found in CSV")
         return {"updated": 0, "failed": 0}
 
-    conn = psycopg2.connect(connection_string)
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
 
+    # The load is one transaction, and a lost commit just means re-running
+    # it, so don't wait on the WAL flush; the extra work_mem keeps the
+    # UPDATE ... FROM hash join over the staged rows in memory
+    cur.execute("SET LOCAL synchronous_commit = off")
+    cur.execute("SET LOCAL work_mem = '256MB'")
+
     cur.execute("""
         CREATE TEMP TABLE finance_csv_updates (
             leaid VARCHAR(7) PRIMARY KEY,
@@ -173,16 +270,13 @@ def load_finance_csv(
         )
     """)
 
-    insert_sql = """
-        INSERT INTO finance_csv_updates VALUES %s
-        ON CONFLICT (leaid) DO NOTHING
-    """
-    template = "(%s" + ", %s" * 27 + ")"
+    # The first row for a district wins
+    by_leaid = {}
+    for record in records:
+        by_leaid.setdefault(record[0], record)
 
     print("Loading into temp table...")
-    for i in tqdm(range(0, len(records), 1000), desc="Loading"):
-        batch = records[i:i+1000]
-        execute_values(cur, insert_sql, batch, template=template)
+    _copy_rows(cur, "finance_csv_updates", by_leaid.values())
 
     print("Updating districts table...")
     cur.execute("""
@@ -234,7 +328,8 @@ def load_finance_csv(
     cur.execute("DROP TABLE finance_csv_updates")
     conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
 
     return {"updated": updated, "sped_per_student": sped_computed}
 
@@ -242,6 +337,7 @@ def load_finance_csv(
 def load_absenteeism_csv(
     connection_string: str,
     csv_path: str,
+    conn=None,
 ) -> dict:
     """
     Load chronic absenteeism data from a bulk CSV download.
@@ -251,69 +347,103 @@ def load_absenteeism_csv(
     Args:
         connection_string: PostgreSQL connection string
         csv_path: Path to absenteeism CSV from Urban Institute Data Explorer
+        conn: Connection to run on, committed but left open; a new one is
+            opened when omitted
 
     Returns:
         Dict with counts
     """
     import psycopg2
-    from psycopg2.extras import execute_values
 
     print(f"Reading absenteeism CSV: {csv_path}")
 
-    district_absent = defaultdict(int)
-    district_enrollment = defaultdict(int)
+    # School-level total rows are buffered for COPY and summed per district
+    # in Postgres rather than in Python dicts
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    total_rows = 0
     year = None
     row_count = 0
 
     with open(csv_path, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
+        col, rows = _read_csv_rows(f, ABSENTEEISM_CSV_COLUMNS)
 
-        for row in reader:
+        for row in rows:
             row_count += 1
             if row_count % 500000 == 0:
                 print(f"  Read {row_count:,} rows...")
 
-            leaid = row.get('leaid')
+            leaid = row[col['leaid']]
             if not leaid:
                 continue
 
             # Only aggregate totals (sex=99, race=99, disability=99)
-            sex = _clean_int(row.get('sex'))
-            race = _clean_int(row.get('race'))
-            disability = _clean_int(row.get('disability'))
-
-            if sex != 99 or race != 99 or disability != 99:
+            if not (_is_total(row[col['sex']])
+                    and _is_total(row[col['race']])
+                    and _is_total(row[col['disability']])):
                 continue
 
             if year is None:
-                year = _clean_int(row.get('year'))
+                year = _clean_int(row[col['year']])
+
+            leaid_str = _leaid_str(leaid)
+            chronic_absent = _clean_int(row[col['chronic_absent']])
+            enrollment = _clean_int(row[col['enrollment_crdc']])
+
+            writer.writerow((leaid_str, chronic_absent, enrollment))
+            total_rows += 1
+
+    if not total_rows:
+        print(f"Read {row_count:,} total rows, aggregated to 0 districts (year: {year})")
+        print("No valid absenteeism records found")
+        return {"updated": 0}
 
-            leaid_str = str(int(float(leaid))).zfill(7)
-            chronic_absent = _clean_int(row.get('chronic_absent'))
-            enrollment = _clean_int(row.get('enrollment_crdc'))
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
+    cur = conn.cursor()
 
-            if chronic_absent is not None:
-                district_absent[leaid_str] += chronic_absent
-            if enrollment is not None:
-                district_enrollment[leaid_str] += enrollment
+    # The load is one transaction, and a lost commit just means re-running
+    # it, so don't wait on the WAL flush; the extra work_mem keeps the
+    # UPDATE ... FROM hash join over the staged rows in memory
+    cur.execute("SET LOCAL synchronous_commit = off")
+    cur.execute("SET LOCAL work_mem = '256MB'")
 
-    print(f"Read {row_count:,} total rows, aggregated to {len(district_absent)} districts (year: {year})")
+    cur.execute("""
+        CREATE TEMP TABLE absenteeism_csv_rows (
+            leaid VARCHAR(7),
+            chronic_absent INTEGER,
+            enrollment INTEGER
+        )
+    """)
+    buf.seek(0)
+    cur.copy_expert("COPY absenteeism_csv_rows FROM STDIN WITH (FORMAT csv)", buf)
 
-    if not district_absent:
+    # A district is loaded when any of its rows reports chronic_absent
+    cur.execute("""
+        SELECT leaid, SUM(chronic_absent), COALESCE(SUM(enrollment), 0)
+        FROM absenteeism_csv_rows
+        GROUP BY leaid
+        HAVING COUNT(chronic_absent) > 0
+    """)
+    totals = cur.fetchall()
+
+    print(f"Read {row_count:,} total rows, aggregated to {len(totals)} districts (year: {year})")
+
+    if not totals:
         print("No valid absenteeism records found")
+        conn.rollback()
+        cur.close()
+        if own_conn:
+            conn.close()
         return {"updated": 0}
 
     # Build district-level records
     records = []
-    for leaid in district_absent:
-        absent_count = district_absent[leaid]
-        enrollment = district_enrollment.get(leaid, 0)
+    for leaid, absent_count, enrollment in totals:
         rate = round((absent_count / enrollment) * 100, 2) if enrollment > 0 else None
         records.append((leaid, absent_count, rate, year))
 
-    conn = psycopg2.connect(connection_string)
-    cur = conn.cursor()
-
     cur.execute("""
         CREATE TEMP TABLE absenteeism_csv_updates (
             leaid VARCHAR(7) PRIMARY KEY,
@@ -323,8 +453,7 @@ def load_absenteeism_csv(
         )
     """)
 
-    insert_sql = "INSERT INTO absenteeism_csv_updates VALUES %s ON CONFLICT (leaid) DO NOTHING"
-    execute_values(cur, insert_sql, records, template="(%s, %s, %s, %s)")
+    _copy_rows(cur, "absenteeism_csv_updates", records)
 
     print("Updating districts table...")
     cur.execute("""
@@ -338,10 +467,11 @@ def load_absenteeism_csv(
     updated = cur.rowcount
     print(f"Updated {updated} districts with absenteeism data")
 
-    cur.execute("DROP TABLE absenteeism_csv_updates")
+    cur.execute("DROP TABLE absenteeism_csv_updates, absenteeism_csv_rows")
     conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
 
     return {"updated": updated, "districts_aggregated": len(records)}
 
@@ -349,6 +479,7 @@ def load_absenteeism_csv(
 def load_assessments_csv(
     connection_string: str,
     csv_path: str,
+    conn=None,
 ) -> dict:
     """
     Load assessment proficiency data from a bulk CSV download.
@@ -356,12 +487,13 @@ def load_assessments_csv(
     Args:
         connection_string: PostgreSQL connection string
         csv_path: Path to assessments CSV from Urban Institute Data Explorer
+        conn: Connection to run on, committed but left open; a new one is
+            opened when omitted
 
     Returns:
         Dict with counts
     """
     import psycopg2
-    from psycopg2.extras import execute_values
 
     print(f"Reading assessments CSV: {csv_path}")
 
@@ -369,25 +501,23 @@ def load_assessments_csv(
     year = None
 
     with open(csv_path, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
+        col, rows = _read_csv_rows(f, ASSESSMENT_CSV_COLUMNS)
 
-        for row in reader:
-            leaid = row.get('leaid')
+        for row in rows:
+            leaid = row[col['leaid']]
             if not leaid:
                 continue
 
             # Only use totals (race=99, sex=99)
-            race = _clean_int(row.get('race'))
-            sex = _clean_int(row.get('sex'))
-            if race != 99 or sex != 99:
+            if not (_is_total(row[col['race']]) and _is_total(row[col['sex']])):
                 continue
 
             if year is None:
-                year = _clean_int(row.get('year'))
+                year = _clean_int(row[col['year']])
 
-            leaid_str = str(int(float(leaid))).zfill(7)
-            math_prof = _clean_val(row.get('math_test_pct_prof_midpt'))
-            read_prof = _clean_val(row.get('read_test_pct_prof_midpt'))
+            leaid_str = _leaid_str(leaid)
+            math_prof = _clean_val(row[col['math_test_pct_prof_midpt']])
+            read_prof = _clean_val(row[col['read_test_pct_prof_midpt']])
 
             if math_prof is not None or read_prof is not None:
                 existing = records.get(leaid_str, {})
@@ -407,9 +537,17 @@ def load_assessments_csv(
         for leaid, r in records.items()
     ]
 
-    conn = psycopg2.connect(connection_string)
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
 
+    # The load is one transaction, and a lost commit just means re-running
+    # it, so don't wait on the WAL flush; the extra work_mem keeps the
+    # UPDATE ... FROM hash join over the staged rows in memory
+    cur.execute("SET LOCAL synchronous_commit = off")
+    cur.execute("SET LOCAL work_mem = '256MB'")
+
     cur.execute("""
         CREATE TEMP TABLE assessment_csv_updates (
             leaid VARCHAR(7) PRIMARY KEY,
@@ -419,8 +557,7 @@ def load_assessments_csv(
         )
     """)
 
-    insert_sql = "INSERT INTO assessment_csv_updates VALUES %s ON CONFLICT (leaid) DO NOTHING"
-    execute_values(cur, insert_sql, values, template="(%s, %s, %s, %s)")
+    _copy_rows(cur, "assessment_csv_updates", values)
 
     print("Updating districts table...")
     cur.execute("""
@@ -437,7 +574,8 @@ def load_assessments_csv(
     cur.execute("DROP TABLE assessment_csv_updates")
     conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
 
     return {"updated": updated}
 
@@ -481,17 +619,24 @@ Examples:
         valid_params = [p for p in params.split("&") if p and not p.startswith("pgbouncer")]
         connection_string = base_url + ("?" + "&".join(valid_params) if valid_params else "")
 
-    if args.finance:
-        result = load_finance_csv(connection_string, args.finance)
-        print(f"\nFinance CSV result: {result}")
-
-    if args.absenteeism:
-        result = load_absenteeism_csv(connection_string, args.absenteeism)
-        print(f"\nAbsenteeism CSV result: {result}")
+    import psycopg2
 
-    if args.assessments:
-        result = load_assessments_csv(connection_string, args.assessments)
-        print(f"\nAssessments CSV result: {result}")
+    # One connection for every load; each still commits its own updates
+    conn = psycopg2.connect(connection_string)
+    try:
+        if args.finance:
+            result = load_finance_csv(connection_string, args.finance, conn=conn)
+            print(f"\nFinance CSV result: {result}")
+
+        if args.absenteeism:
+            result = load_absenteeism_csv(connection_string, args.absenteeism, conn=conn)
+            print(f"\nAbsenteeism CSV result: {result}")
+
+        if args.assessments:
+            result = load_assessments_csv(connection_string, args.assessments, conn=conn)
+            print(f"\nAssessments CSV result: {result}")
+    finally:
+        conn.close()
 
     print("\nDone! Run 'python3 run_etl.py --stats-only' to verify.")
 
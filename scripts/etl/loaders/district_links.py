@@ -7,7 +7,7 @@ website and job board URLs.
 
 import csv
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 import psycopg2
 from psycopg2.extras import execute_values
 from tqdm import tqdm
@@ -18,6 +18,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.leaid import normalize_leaid
 
 
+# CSV columns parse_csv_row reads, in the order of its idx positions
+CSV_COLUMNS = ("leaid", "Website", "Job Board")
+
+# Placeholder values the export uses for "no URL" (compared lowercased)
+URL_PLACEHOLDERS = frozenset({"response", "n/a", "none", "-"})
+
+
 def normalize_url(url: Optional[str]) -> Optional[str]:
     """
     Normalize a URL to ensure it has a protocol.
@@ -34,25 +41,30 @@ def normalize_url(url: Optional[str]) -> Optional[str]:
         return None
 
     # Skip placeholder values
-    if url.lower() in ('response', 'n/a', 'none', '-'):
+    if url.lower() in URL_PLACEHOLDERS:
         return None
 
     # Add protocol if missing
-    if not url.startswith(('http://', 'https://')):
-        url = f"https://{url}"
+    if url.startswith(('http://', 'https://')):
+        return url
+    return "https://" + url
 
-    return url
 
-
-def parse_csv_row(row: Dict[str, str]) -> Dict:
+def parse_csv_row(row: List[Optional[str]], idx: Tuple[int, ...]) -> Dict:
     """
     Parse a CSV row into a normalized district links record.
+
+    Args:
+        row: Row values as read by csv.reader
+        idx: Positions of the CSV_COLUMNS columns in the row
     """
-    leaid_raw = row.get("leaid", "")
+    leaid_i, website_i, job_board_i = idx
+
+    leaid_raw = row[leaid_i]
     leaid = normalize_leaid(leaid_raw)
 
-    website = normalize_url(row.get("Website"))
-    job_board = normalize_url(row.get("Job Board"))
+    website = normalize_url(row[website_i])
+    job_board = normalize_url(row[job_board_i])
 
     return {
         "leaid": leaid,
@@ -62,48 +74,75 @@ def parse_csv_row(row: Dict[str, str]) -> Dict:
     }
 
 
-def load_district_links_csv(csv_path: Path) -> List[Dict]:
+def iter_district_links_csv(csv_path: Path) -> Iterator[Dict]:
     """
-    Load and parse the district links CSV file.
+    Parse the district links CSV file, yielding records as they are read.
 
     Args:
         csv_path: Path to the CSV file
 
-    Returns:
-        List of parsed district link records
+    Yields:
+        Parsed district link records
     """
-    records = []
+    parsed = 0
 
     with open(csv_path, "r", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, [])
+        width = len(header)
+
+        # Resolve column positions once. Rows are cut or padded to just past
+        # the header, and a column missing from it points at that last
+        # position: short rows read as None there and missing columns as "",
+        # the way DictReader's row.get() did
+        positions = {name: i for i, name in enumerate(header)}
+        idx = tuple(positions.get(name, width) for name in CSV_COLUMNS)
+        pad = [None] * width + [""]
+
         for row in tqdm(reader, desc="Parsing CSV"):
-            record = parse_csv_row(row)
+            if not row:
+                # Skip blank lines
+                continue
+            del row[width:]
+            row += pad[len(row):]
+            record = parse_csv_row(row, idx)
             # Only keep records with at least one URL
             if record.get("website_url") or record.get("job_board_url"):
-                records.append(record)
+                parsed += 1
+                yield record
 
-    print(f"Parsed {len(records)} records with links from CSV")
-    return records
+    print(f"Parsed {parsed} records with links from CSV")
 
 
-def get_valid_leaids(connection_string: str) -> set:
-    """Get set of valid LEAIDs from districts table."""
-    conn = psycopg2.connect(connection_string)
+def get_valid_leaids(connection_string: str, conn=None) -> set:
+    """
+    Get set of valid LEAIDs from districts table.
+
+    Runs on conn when given (ending its transaction, but leaving it open);
+    otherwise opens its own connection.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
     cur.execute("SELECT leaid FROM districts")
-    leaids = {row[0] for row in cur.fetchall()}
+    leaids = {leaid for (leaid,) in cur}
+    conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
     return leaids
 
 
 def categorize_records(
-    records: List[Dict],
+    records: Iterable[Dict],
     valid_leaids: set
 ) -> Tuple[List[Dict], List[Dict]]:
     """
     Categorize records into matched and unmatched.
 
+    records may be any iterable; it is consumed once.
+
     Returns:
         Tuple of (matched_records, unmatched_records)
     """
@@ -124,7 +163,8 @@ def categorize_records(
 def update_district_links(
     connection_string: str,
     records: List[Dict],
-    batch_size: int = 500
+    batch_size: int = 500,
+    conn=None,
 ) -> int:
     """
     Update districts with website and job board URLs.
@@ -132,7 +172,9 @@ def update_district_links(
     Args:
         connection_string: PostgreSQL connection string
         records: List of matched district link records
-        batch_size: Number of records per batch
+        batch_size: Number of records per UPDATE statement
+        conn: Connection to run on, committed but left open; a new one is
+            opened when omitted
 
     Returns:
         Number of districts updated
@@ -140,23 +182,18 @@ def update_district_links(
     if not records:
         return 0
 
-    conn = psycopg2.connect(connection_string)
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
 
-    updated = 0
-
-    # Process in batches
-    for i in tqdm(range(0, len(records), batch_size), desc="Updating districts"):
-        batch = records[i:i + batch_size]
-
-        # Build values for batch update
-        values = [
-            (r["leaid"], r["website_url"], r["job_board_url"])
-            for r in batch
-        ]
-
-        # Use UPDATE with VALUES for batch update
-        execute_values(
+    # All batches run in one transaction, committed once at the end, so a
+    # failure part way through leaves no districts half updated
+    try:
+        # One execute_values call sends batch_size rows per UPDATE. It only
+        # leaves rowcount set for the last page, so updated districts are
+        # counted from what each page returns
+        updated_rows = execute_values(
             cur,
             """
             UPDATE districts AS d
@@ -166,16 +203,23 @@ def update_district_links(
                 updated_at = NOW()
             FROM (VALUES %s) AS v(leaid, website_url, job_board_url)
             WHERE d.leaid = v.leaid
+            RETURNING d.leaid
             """,
-            values,
-            template="(%s, %s, %s)"
+            ((r["leaid"], r["website_url"], r["job_board_url"]) for r in records),
+            template="(%s, %s, %s)",
+            page_size=batch_size,
+            fetch=True,
         )
+        updated = len(updated_rows)
 
-        updated += cur.rowcount
         conn.commit()
-
-    cur.close()
-    conn.close()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        if own_conn:
+            conn.close()
 
     print(f"Updated {updated} districts with links")
     return updated
@@ -194,10 +238,14 @@ def generate_report(
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Count stats
-    website_count = sum(1 for r in matched if r.get("website_url"))
-    job_board_count = sum(1 for r in matched if r.get("job_board_url"))
-    both_count = sum(1 for r in matched if r.get("website_url") and r.get("job_board_url"))
+    # Count stats in one pass
+    website_count = job_board_count = both_count = 0
+    for r in matched:
+        has_website = bool(r.get("website_url"))
+        has_job_board = bool(r.get("job_board_url"))
+        website_count += has_website
+        job_board_count += has_job_board
+        both_count += has_website and has_job_board
 
     summary = {
         "total_parsed": len(matched) + len(unmatched),
@@ -212,14 +260,12 @@ def generate_report(
     if unmatched:
         unmatched_path = output_dir / "district_links_unmatched.csv"
         with open(unmatched_path, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=["leaid_raw", "website_url", "job_board_url"])
-            writer.writeheader()
-            for r in unmatched:
-                writer.writerow({
-                    "leaid_raw": r.get("leaid_raw"),
-                    "website_url": r.get("website_url"),
-                    "job_board_url": r.get("job_board_url"),
-                })
+            writer = csv.writer(f)
+            writer.writerow(["leaid_raw", "website_url", "job_board_url"])
+            writer.writerows(
+                (r["leaid_raw"], r["website_url"], r["job_board_url"])
+                for r in unmatched
+            )
         print(f"Wrote unmatched records to: {unmatched_path}")
 
     print("\n=== District Links Import Summary ===")
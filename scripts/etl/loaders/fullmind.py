@@ -10,10 +10,14 @@ Note: As of Jan 2026, Fullmind data is stored directly on the districts table
 
 import os
 import csv
+import io
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from sys import intern
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 import psycopg2
-from psycopg2.extras import execute_values
 from tqdm import tqdm
 
 # When the scheduler owns pipeline columns, skip writing them from CSV loader
@@ -72,43 +76,88 @@ CSV_COLUMNS = {
     "FY27 Open Pipeline Weighted": "fy27_open_pipeline_weighted",
 }
 
-
-def parse_csv_row(row: Dict[str, str]) -> Dict:
+CURRENCY_FIELDS = (
+    "fy25_sessions_revenue", "fy25_sessions_take",
+    "fy26_sessions_revenue", "fy26_sessions_take",
+    "fy25_closed_won_net_booking", "fy25_net_invoicing",
+    "fy26_closed_won_net_booking", "fy26_net_invoicing",
+    "fy26_open_pipeline", "fy26_open_pipeline_weighted",
+    "fy27_open_pipeline", "fy27_open_pipeline_weighted",
+)
+
+INT_FIELDS = (
+    "fy25_sessions_count", "fy26_sessions_count",
+    "fy25_closed_won_opp_count", "fy26_closed_won_opp_count",
+    "fy26_open_pipeline_opp_count", "fy27_open_pipeline_opp_count",
+)
+
+# Fields summed when a leaid appears on several rows
+NUMERIC_FIELDS = CURRENCY_FIELDS + INT_FIELDS
+
+# Low-cardinality text fields; every row sharing a value shares one string
+INTERNED_FIELDS = ("sales_executive", "state_abbrev")
+
+# Most cells of the export are blanks and round amounts like "$0.00", so the
+# parsed value of each distinct string is cached
+_parse_currency = lru_cache(maxsize=None)(parse_currency)
+_parse_int = lru_cache(maxsize=None)(parse_int)
+
+# fullmind_updates temp table columns, in COPY order
+UPDATE_COLUMNS = (
+    "leaid", "account_name", "sales_executive", "lmsid",
+    "fy25_sessions_revenue", "fy25_sessions_take", "fy25_sessions_count",
+    "fy26_sessions_revenue", "fy26_sessions_take", "fy26_sessions_count",
+    "fy25_closed_won_opp_count", "fy25_closed_won_net_booking", "fy25_net_invoicing",
+    "fy26_closed_won_opp_count", "fy26_closed_won_net_booking", "fy26_net_invoicing",
+    "fy26_open_pipeline_opp_count", "fy26_open_pipeline", "fy26_open_pipeline_weighted",
+    "fy27_open_pipeline_opp_count", "fy27_open_pipeline", "fy27_open_pipeline_weighted",
+    "is_customer", "has_open_pipeline",
+)
+_update_row = itemgetter(*UPDATE_COLUMNS)
+
+# unmatched_accounts columns written by insert_unmatched_accounts, in COPY order
+UNMATCHED_COLUMNS = (
+    "account_name", "sales_executive", "state_abbrev", "lmsid",
+    "leaid_raw", "match_failure_reason",
+    "fy25_net_invoicing", "fy26_net_invoicing",
+    "fy26_open_pipeline", "fy27_open_pipeline",
+    "is_customer", "has_open_pipeline",
+)
+
+# Columns of the unmatched_fullmind.csv report
+REPORT_COLUMNS = (
+    "account_name", "state_abbrev", "sales_executive",
+    "leaid_raw", "match_failure_reason",
+    "fy25_net_invoicing", "fy26_net_invoicing",
+    "fy26_open_pipeline", "fy27_open_pipeline",
+    "is_customer", "has_open_pipeline",
+)
+
+
+def parse_csv_row(row: List[Optional[str]], idx: List[Tuple[int, str]]) -> Dict:
     """
     Parse a CSV row into a normalized record.
 
+    idx pairs each CSV_COLUMNS position in row with its internal name.
     Applies currency parsing, integer parsing, and LEAID normalization.
     """
-    record = {}
-
     # Map columns
-    for csv_col, internal_col in CSV_COLUMNS.items():
-        record[internal_col] = row.get(csv_col, "")
+    record = {internal_col: row[pos] for pos, internal_col in idx}
+    for field in INTERNED_FIELDS:
+        if record[field] is not None:
+            record[field] = intern(record[field])
 
     # Normalize LEAID
     record["leaid_raw"] = record["leaid"]  # Keep original for debugging
     record["leaid"] = normalize_leaid(record["leaid"])
 
     # Parse currency fields
-    currency_fields = [
-        "fy25_sessions_revenue", "fy25_sessions_take",
-        "fy26_sessions_revenue", "fy26_sessions_take",
-        "fy25_closed_won_net_booking", "fy25_net_invoicing",
-        "fy26_closed_won_net_booking", "fy26_net_invoicing",
-        "fy26_open_pipeline", "fy26_open_pipeline_weighted",
-        "fy27_open_pipeline", "fy27_open_pipeline_weighted",
-    ]
-    for field in currency_fields:
-        record[field] = parse_currency(record.get(field, ""))
+    for field in CURRENCY_FIELDS:
+        record[field] = _parse_currency(record[field])
 
     # Parse integer fields
-    int_fields = [
-        "fy25_sessions_count", "fy26_sessions_count",
-        "fy25_closed_won_opp_count", "fy26_closed_won_opp_count",
-        "fy26_open_pipeline_opp_count", "fy27_open_pipeline_opp_count",
-    ]
-    for field in int_fields:
-        record[field] = parse_int(record.get(field, ""))
+    for field in INT_FIELDS:
+        record[field] = _parse_int(record[field])
 
     # Compute status flags
     record["is_customer"] = _compute_is_customer(record)
@@ -117,48 +166,75 @@ def parse_csv_row(row: Dict[str, str]) -> Dict:
     return record
 
 
-def load_fullmind_csv(csv_path: Path) -> List[Dict]:
+def iter_fullmind_csv(csv_path: Path) -> Iterator[Dict]:
     """
-    Load and parse the Fullmind CSV file.
+    Parse the Fullmind CSV file, yielding records as they are read.
 
     Args:
         csv_path: Path to the CSV file
 
-    Returns:
-        List of parsed records
+    Yields:
+        Parsed records
     """
-    records = []
+    parsed = 0
 
     with open(csv_path, "r", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, [])
+        width = len(header)
+
+        # Resolve column positions once. Rows are cut or padded to just past
+        # the header, and a column missing from it points at that last
+        # position: short rows read as None there and missing columns as "",
+        # the way DictReader's row.get(col, "") did
+        positions = {name: i for i, name in enumerate(header)}
+        idx = [
+            (positions.get(csv_col, width), internal_col)
+            for csv_col, internal_col in CSV_COLUMNS.items()
+        ]
+        pad = [None] * width + [""]
+
         for row in tqdm(reader, desc="Parsing CSV"):
-            record = parse_csv_row(row)
-            records.append(record)
+            if not row:
+                # Skip blank lines
+                continue
+            del row[width:]
+            row += pad[len(row):]
+            parsed += 1
+            yield parse_csv_row(row, idx)
 
-    print(f"Parsed {len(records)} records from CSV")
-    return records
+    print(f"Parsed {parsed} records from CSV")
 
 
-def get_valid_leaids(connection_string: str) -> set:
-    """Get set of valid LEAIDs from districts table."""
-    conn = psycopg2.connect(connection_string)
+def get_valid_leaids(connection_string: str, conn=None) -> set:
+    """
+    Get set of valid LEAIDs from districts table.
+
+    Runs on conn when given (ending its transaction, but leaving it open);
+    otherwise opens its own connection.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
     cur.execute("SELECT leaid FROM districts")
-    leaids = {row[0] for row in cur.fetchall()}
+    leaids = {leaid for (leaid,) in cur}
+    conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
     return leaids
 
 
 def categorize_records(
-    records: List[Dict],
+    records: Iterable[Dict],
     valid_leaids: set
 ) -> Tuple[List[Dict], List[Dict]]:
     """
     Categorize records into matched and unmatched.
 
     Args:
-        records: All parsed records
+        records: All parsed records (any iterable, consumed once)
         valid_leaids: Set of valid LEAIDs from districts table
 
     Returns:
@@ -188,50 +264,87 @@ def categorize_records(
     return matched, unmatched
 
 
+# Backslash escapes for COPY text format
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value) -> str:
+    """Format one value for COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, str):
+        return value.translate(_COPY_ESCAPES)
+    return str(value)
+
+
+def _copy_rows(cur, table: str, columns, rows) -> None:
+    """
+    COPY rows (tuples, None for NULL) into table's columns in one round trip.
+
+    Uses text format rather than csv, which can't tell an empty string
+    (account names and LMSIDs can be blank) from NULL.
+    """
+    buf = io.StringIO()
+    buf.writelines("\t".join(map(_copy_value, row)) + "\n" for row in rows)
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buf)
+
+
 def update_districts_with_fullmind_data(
     connection_string: str,
     records: List[Dict],
-    batch_size: int = 500
+    conn=None,
 ) -> int:
     """
     Update districts table with Fullmind CRM data.
 
     Deduplicates by leaid, aggregating numeric fields.
     Updates the Fullmind columns directly on the districts table.
+
+    Runs on conn when given (committing, but leaving it open); otherwise
+    opens its own connection.
     """
     if not records:
         return 0
 
-    # Deduplicate by leaid - aggregate numeric fields, keep last string values
+    # Deduplicate by leaid - aggregate numeric fields, keep first string values.
+    # Most leaids appear once, so a record is only copied (to aggregate into
+    # without touching the caller's) once a second one turns up
     deduped = {}
-    numeric_fields = [
-        "fy25_sessions_revenue", "fy25_sessions_take", "fy25_sessions_count",
-        "fy26_sessions_revenue", "fy26_sessions_take", "fy26_sessions_count",
-        "fy25_closed_won_opp_count", "fy25_closed_won_net_booking", "fy25_net_invoicing",
-        "fy26_closed_won_opp_count", "fy26_closed_won_net_booking", "fy26_net_invoicing",
-        "fy26_open_pipeline_opp_count", "fy26_open_pipeline", "fy26_open_pipeline_weighted",
-        "fy27_open_pipeline_opp_count", "fy27_open_pipeline", "fy27_open_pipeline_weighted",
-    ]
+    aggregated = {}
 
     for r in records:
         leaid = r["leaid"]
-        if leaid not in deduped:
-            deduped[leaid] = r.copy()
-        else:
-            # Aggregate numeric fields
-            for field in numeric_fields:
-                deduped[leaid][field] = deduped[leaid][field] + r[field]
-            # Recalculate boolean flags after aggregation
-            deduped[leaid]["is_customer"] = _compute_is_customer(deduped[leaid])
-            deduped[leaid]["has_open_pipeline"] = _compute_has_open_pipeline(deduped[leaid])
-            # Keep first account_name, sales_executive, lmsid (they should be the same)
+        first = deduped.setdefault(leaid, r)
+        if first is r:
+            continue
+        agg = aggregated.get(leaid)
+        if agg is None:
+            agg = aggregated[leaid] = deduped[leaid] = first.copy()
+        # Aggregate numeric fields
+        for field in NUMERIC_FIELDS:
+            agg[field] += r[field]
+        # Keep first account_name, sales_executive, lmsid (they should be the same)
+
+    # Recalculate boolean flags after aggregation
+    for agg in aggregated.values():
+        agg["is_customer"] = _compute_is_customer(agg)
+        agg["has_open_pipeline"] = _compute_has_open_pipeline(agg)
 
     records = list(deduped.values())
     print(f"Deduplicated to {len(records)} unique LEAIDs")
 
-    conn = psycopg2.connect(connection_string)
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
 
+    # The reload is one transaction, and a lost commit just means re-running
+    # the ETL, so don't wait on the WAL flush for it
+    cur.execute("SET LOCAL synchronous_commit = off")
+
     # Clear existing Fullmind data on districts (set to NULL/defaults)
     # When SCHEDULER_OWNS_PIPELINE=true, skip pipeline columns — scheduler manages those
     print("Clearing existing Fullmind data on districts...")
@@ -295,53 +408,8 @@ def update_districts_with_fullmind_data(
         )
     """)
 
-    insert_temp_sql = """
-        INSERT INTO fullmind_updates (
-            leaid, account_name, sales_executive, lmsid,
-            fy25_sessions_revenue, fy25_sessions_take, fy25_sessions_count,
-            fy26_sessions_revenue, fy26_sessions_take, fy26_sessions_count,
-            fy25_closed_won_opp_count, fy25_closed_won_net_booking, fy25_net_invoicing,
-            fy26_closed_won_opp_count, fy26_closed_won_net_booking, fy26_net_invoicing,
-            fy26_open_pipeline_opp_count, fy26_open_pipeline, fy26_open_pipeline_weighted,
-            fy27_open_pipeline_opp_count, fy27_open_pipeline, fy27_open_pipeline_weighted,
-            is_customer, has_open_pipeline
-        ) VALUES %s
-    """
-
-    values = [
-        (
-            r["leaid"],
-            r["account_name"],
-            r["sales_executive"],
-            r["lmsid"],
-            r["fy25_sessions_revenue"],
-            r["fy25_sessions_take"],
-            r["fy25_sessions_count"],
-            r["fy26_sessions_revenue"],
-            r["fy26_sessions_take"],
-            r["fy26_sessions_count"],
-            r["fy25_closed_won_opp_count"],
-            r["fy25_closed_won_net_booking"],
-            r["fy25_net_invoicing"],
-            r["fy26_closed_won_opp_count"],
-            r["fy26_closed_won_net_booking"],
-            r["fy26_net_invoicing"],
-            r["fy26_open_pipeline_opp_count"],
-            r["fy26_open_pipeline"],
-            r["fy26_open_pipeline_weighted"],
-            r["fy27_open_pipeline_opp_count"],
-            r["fy27_open_pipeline"],
-            r["fy27_open_pipeline_weighted"],
-            r["is_customer"],
-            r["has_open_pipeline"],
-        )
-        for r in records
-    ]
-
-    print(f"Inserting {len(values)} records into temp table...")
-    for i in tqdm(range(0, len(values), batch_size), desc="Loading temp table"):
-        batch = values[i:i+batch_size]
-        execute_values(cur, insert_temp_sql, batch)
+    print(f"Loading {len(records)} records into temp table...")
+    _copy_rows(cur, "fullmind_updates", UPDATE_COLUMNS, map(_update_row, records))
 
     # Bulk update districts from temp table
     print("Updating districts table...")
@@ -383,7 +451,8 @@ def update_districts_with_fullmind_data(
 
     conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
 
     return updated_count
 
@@ -391,30 +460,32 @@ def update_districts_with_fullmind_data(
 def insert_unmatched_accounts(
     connection_string: str,
     records: List[Dict],
-    batch_size: int = 500
+    conn=None,
 ) -> int:
-    """Insert unmatched accounts into unmatched_accounts table."""
+    """
+    Insert unmatched accounts into unmatched_accounts table.
+
+    Runs on conn when given (committing, but leaving it open); otherwise
+    opens its own connection.
+    """
     if not records:
         return 0
 
-    conn = psycopg2.connect(connection_string)
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
 
+    # Truncate and reload in one transaction; a lost commit is recovered by
+    # re-running the ETL, so skip waiting on the WAL flush
+    cur.execute("SET LOCAL synchronous_commit = off")
+
     # Clear existing unmatched
     print("Clearing existing unmatched_accounts...")
     cur.execute("TRUNCATE TABLE unmatched_accounts")
 
-    insert_sql = """
-        INSERT INTO unmatched_accounts (
-            account_name, sales_executive, state_abbrev, lmsid,
-            leaid_raw, match_failure_reason,
-            fy25_net_invoicing, fy26_net_invoicing,
-            fy26_open_pipeline, fy27_open_pipeline,
-            is_customer, has_open_pipeline
-        ) VALUES %s
-    """
-
-    values = [
+    print(f"Inserting {len(records)} unmatched accounts...")
+    _copy_rows(cur, "unmatched_accounts", UNMATCHED_COLUMNS, (
         (
             r["account_name"],
             r["sales_executive"],
@@ -430,23 +501,20 @@ def insert_unmatched_accounts(
             r["has_open_pipeline"],
         )
         for r in records
-    ]
-
-    print(f"Inserting {len(values)} unmatched accounts...")
-    for i in tqdm(range(0, len(values), batch_size), desc="Inserting"):
-        batch = values[i:i+batch_size]
-        execute_values(cur, insert_sql, batch)
+    ))
 
     conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
 
-    return len(values)
+    return len(records)
 
 
 def upsert_unmatched_to_districts(
     connection_string: str,
     records: List[Dict],
+    conn=None,
 ) -> Dict[str, int]:
     """
     Create or update M-series district rows for unmatched CRM accounts.
@@ -456,14 +524,22 @@ def upsert_unmatched_to_districts(
         with an M-series leaid, UPDATE its financial fields.
       - Otherwise, generate a new M-series leaid and INSERT.
 
+    Runs on conn when given (committing, but leaving it open); otherwise
+    opens its own connection.
+
     Returns dict with counts: {"created": N, "updated": N}
     """
     if not records:
         return {"created": 0, "updated": 0}
 
-    conn = psycopg2.connect(connection_string)
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
     cur = conn.cursor()
 
+    # Like the other Fullmind writes, a lost commit only means re-running the ETL
+    cur.execute("SET LOCAL synchronous_commit = off")
+
     # Deduplicate unmatched records by (account_name, state_abbrev),
     # aggregating numeric fields just like the matched path does
     deduped = {}
@@ -580,7 +656,8 @@ def upsert_unmatched_to_districts(
 
     conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
 
     print(f"Non-LEAID accounts in districts: {created} created, {updated} updated")
     return {"created": created, "updated": updated}
@@ -602,23 +679,16 @@ def generate_match_report(
     Returns:
         Summary statistics dict
     """
-    import json
+    import orjson
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Write unmatched CSV
     unmatched_csv = output_dir / "unmatched_fullmind.csv"
     with open(unmatched_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            "account_name", "state_abbrev", "sales_executive",
-            "leaid_raw", "match_failure_reason",
-            "fy25_net_invoicing", "fy26_net_invoicing",
-            "fy26_open_pipeline", "fy27_open_pipeline",
-            "is_customer", "has_open_pipeline",
-        ])
-        writer.writeheader()
-        for r in unmatched:
-            writer.writerow({k: r.get(k, "") for k in writer.fieldnames})
+        writer = csv.writer(f)
+        writer.writerow(REPORT_COLUMNS)
+        writer.writerows(map(itemgetter(*REPORT_COLUMNS), unmatched))
 
     print(f"Wrote unmatched accounts to {unmatched_csv}")
 
@@ -626,33 +696,37 @@ def generate_match_report(
     total = len(matched) + len(unmatched)
     match_rate = len(matched) / total * 100 if total > 0 else 0
 
-    # Breakdown by failure reason
-    failure_reasons = {}
-    for r in unmatched:
-        reason = r.get("match_failure_reason", "unknown")
-        failure_reasons[reason] = failure_reasons.get(reason, 0) + 1
+    # Customer and pipeline counts for each side, one pass apiece
+    matched_customers = matched_pipeline = 0
+    for r in matched:
+        matched_customers += r["is_customer"]
+        matched_pipeline += r["has_open_pipeline"]
 
-    # Breakdown by state
-    unmatched_by_state = {}
+    # Breakdowns by failure reason and by state
+    failure_reasons = Counter()
+    unmatched_by_state = Counter()
+    unmatched_customers = unmatched_pipeline = 0
     for r in unmatched:
-        state = r.get("state_abbrev", "XX")
-        unmatched_by_state[state] = unmatched_by_state.get(state, 0) + 1
+        failure_reasons[r.get("match_failure_reason", "unknown")] += 1
+        unmatched_by_state[r.get("state_abbrev", "XX")] += 1
+        unmatched_customers += r["is_customer"]
+        unmatched_pipeline += r["has_open_pipeline"]
 
     summary = {
         "total_records": total,
         "matched_count": len(matched),
         "unmatched_count": len(unmatched),
         "match_rate_percent": round(match_rate, 2),
-        "failure_reasons": failure_reasons,
+        "failure_reasons": dict(failure_reasons),
         "unmatched_by_state": dict(sorted(
             unmatched_by_state.items(),
             key=lambda x: x[1],
             reverse=True
         )),
-        "matched_customers": sum(1 for r in matched if r["is_customer"]),
-        "matched_pipeline": sum(1 for r in matched if r["has_open_pipeline"]),
-        "unmatched_customers": sum(1 for r in unmatched if r["is_customer"]),
-        "unmatched_pipeline": sum(1 for r in unmatched if r["has_open_pipeline"]),
+        "matched_customers": matched_customers,
+        "matched_pipeline": matched_pipeline,
+        "unmatched_customers": unmatched_customers,
+        "unmatched_pipeline": unmatched_pipeline,
     }
 
     # Include district upsert counts if provided
@@ -662,8 +736,10 @@ def generate_match_report(
 
     # Write summary JSON
     summary_json = output_dir / "match_summary.json"
-    with open(summary_json, "w") as f:
-        json.dump(summary, f, indent=2)
+    # Unmatched rows with no state count under a None key, which
+    # OPT_NON_STR_KEYS writes as "null" the way json.dump did
+    with open(summary_json, "wb") as f:
+        f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
     print(f"Wrote match summary to {summary_json}")
 
@@ -705,32 +781,35 @@ def main():
     if not csv_path.exists():
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
 
-    # Load and parse CSV
-    records = load_fullmind_csv(csv_path)
-
-    # Get valid LEAIDs
-    print("Fetching valid LEAIDs from database...")
-    valid_leaids = get_valid_leaids(connection_string)
-    print(f"Found {len(valid_leaids)} valid district LEAIDs")
-
-    # Categorize
-    matched, unmatched = categorize_records(records, valid_leaids)
-    print(f"Matched: {len(matched)}, Unmatched: {len(unmatched)}")
-
-    # Update districts with matched Fullmind data
-    matched_count = update_districts_with_fullmind_data(connection_string, matched)
-    print(f"Updated {matched_count} district records with Fullmind data")
-
-    # Insert unmatched into audit table
-    unmatched_count = insert_unmatched_accounts(connection_string, unmatched)
-    print(f"Inserted {unmatched_count} unmatched accounts")
-
-    # Create/update M-series district rows for unmatched accounts
-    district_upsert_counts = upsert_unmatched_to_districts(connection_string, unmatched)
-
-    # Refresh materialized view so map tiles reflect new data
     from utils.refresh_views import refresh_map_features
-    refresh_map_features(connection_string)
+
+    # One connection for the LEAID lookup, every load, and the view refresh
+    conn = psycopg2.connect(connection_string)
+    try:
+        # Get valid LEAIDs
+        print("Fetching valid LEAIDs from database...")
+        valid_leaids = get_valid_leaids(connection_string, conn=conn)
+        print(f"Found {len(valid_leaids)} valid district LEAIDs")
+
+        # Parse and categorize in one pass, without holding every parsed record
+        matched, unmatched = categorize_records(iter_fullmind_csv(csv_path), valid_leaids)
+        print(f"Matched: {len(matched)}, Unmatched: {len(unmatched)}")
+
+        # Update districts with matched Fullmind data
+        matched_count = update_districts_with_fullmind_data(connection_string, matched, conn=conn)
+        print(f"Updated {matched_count} district records with Fullmind data")
+
+        # Insert unmatched into audit table
+        unmatched_count = insert_unmatched_accounts(connection_string, unmatched, conn=conn)
+        print(f"Inserted {unmatched_count} unmatched accounts")
+
+        # Create/update M-series district rows for unmatched accounts
+        district_upsert_counts = upsert_unmatched_to_districts(connection_string, unmatched, conn=conn)
+
+        # Refresh materialized view so map tiles reflect new data
+        refresh_map_features(connection_string, conn=conn)
+    finally:
+        conn.close()
 
     # Generate report
     output_dir = Path(args.output_dir)
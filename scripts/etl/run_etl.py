@@ -60,7 +60,7 @@ from loaders.urban_institute_title1 import (
     aggregate_district_title1,
 )
 from loaders.fullmind import (
-    load_fullmind_csv,
+    iter_fullmind_csv,
     get_valid_leaids,
     categorize_records,
     update_districts_with_fullmind_data,
@@ -68,7 +68,7 @@ from loaders.fullmind import (
     generate_match_report,
 )
 from loaders.district_links import (
-    load_district_links_csv,
+    iter_district_links_csv,
     get_valid_leaids as get_valid_leaids_links,
     categorize_records as categorize_links,
     update_district_links,
@@ -346,19 +346,23 @@ def run_fullmind_etl(
 
     print(f"Loading from: {csv_path}")
 
-    # Parse CSV
-    records = load_fullmind_csv(csv_path)
+    import psycopg2
 
-    # Get valid LEAIDs
-    valid_leaids = get_valid_leaids(connection_string)
-    print(f"Found {len(valid_leaids)} valid district LEAIDs in database")
+    # One connection for the LEAID lookup and both loads
+    conn = psycopg2.connect(connection_string)
+    try:
+        # Get valid LEAIDs
+        valid_leaids = get_valid_leaids(connection_string, conn=conn)
+        print(f"Found {len(valid_leaids)} valid district LEAIDs in database")
 
-    # Categorize
-    matched, unmatched = categorize_records(records, valid_leaids)
+        # Parse and categorize in one pass, without holding every parsed record
+        matched, unmatched = categorize_records(iter_fullmind_csv(csv_path), valid_leaids)
 
-    # Update districts with Fullmind data
-    update_districts_with_fullmind_data(connection_string, matched)
-    insert_unmatched_accounts(connection_string, unmatched)
+        # Update districts with Fullmind data
+        update_districts_with_fullmind_data(connection_string, matched, conn=conn)
+        insert_unmatched_accounts(connection_string, unmatched, conn=conn)
+    finally:
+        conn.close()
 
     # Generate report
     output_path = Path(output_dir)
@@ -933,18 +937,22 @@ def run_district_links_etl(
 
     print(f"Loading from: {csv_path}")
 
-    # Parse CSV
-    records = load_district_links_csv(csv_path)
+    import psycopg2
 
-    # Get valid LEAIDs
-    valid_leaids = get_valid_leaids_links(connection_string)
-    print(f"Found {len(valid_leaids)} valid district LEAIDs in database")
+    # One connection for the LEAID lookup and the update
+    conn = psycopg2.connect(connection_string)
+    try:
+        # Get valid LEAIDs
+        valid_leaids = get_valid_leaids_links(connection_string, conn=conn)
+        print(f"Found {len(valid_leaids)} valid district LEAIDs in database")
 
-    # Categorize
-    matched, unmatched = categorize_links(records, valid_leaids)
+        # Parse and categorize in one pass, without holding every parsed record
+        matched, unmatched = categorize_links(iter_district_links_csv(csv_path), valid_leaids)
 
-    # Update districts with links
-    update_district_links(connection_string, matched)
+        # Update districts with links
+        update_district_links(connection_string, matched, conn=conn)
+    finally:
+        conn.close()
 
     # Generate report
     output_path = Path(output_dir)
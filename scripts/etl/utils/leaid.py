@@ -1,9 +1,13 @@
 """LEAID normalization utilities."""
 
 import math
+from functools import lru_cache
 from typing import Union, Optional
 
 
+# Loaders call this once per CSV row, and files repeat the same LEAIDs on
+# many rows. typed=True keeps True from sharing 1's cache entry
+@lru_cache(maxsize=None, typed=True)
 def normalize_leaid(value: Union[str, float, int, None]) -> Optional[str]:
     """
     Normalize a LEAID to a 7-character string with leading zeros.
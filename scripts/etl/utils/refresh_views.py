@@ -3,7 +3,7 @@
 import psycopg2
 
 
-def refresh_map_features(connection_string: str):
+def refresh_map_features(connection_string: str, conn=None):
     """
     Refresh the district_map_features materialized view.
 
@@ -11,12 +11,20 @@ def refresh_map_features(connection_string: str):
     - district_financials (vendor revenue, competitor spend)
     - districts (geometry, ownership)
     - territory_plan_districts (plan memberships)
+
+    If conn is given the refresh runs and is committed on it (left open)
+    instead of on a new autocommit connection.
     """
-    conn = psycopg2.connect(connection_string)
-    conn.set_isolation_level(0)  # autocommit required for REFRESH
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(connection_string)
+        conn.set_isolation_level(0)  # autocommit required for REFRESH
     cur = conn.cursor()
     print("Refreshing district_map_features materialized view...")
     cur.execute("REFRESH MATERIALIZED VIEW district_map_features")
+    if not own_conn:
+        conn.commit()
     print("district_map_features refreshed.")
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()